@@ -0,0 +1,25 @@
+"""Fidelity versus size of the approximate QFT in CMULT(a)MOD(N).
+
+For several moduli, prints `approximation_report` for all approximation degrees,
+i.e. the size, depth and CX count of the transpiled gate and its mean fidelity
+with the exact gate on random inputs. The degree suggested by
+`default_approximation_degree` for the (n + 1)-qubit QFT is marked with a `*`.
+"""
+
+from quantum.gates import approximation_report, default_approximation_degree
+
+if __name__ == "__main__":
+    print(
+        f"{'N':>6} {'width':>6} {'degree':>7} {'size':>8} {'depth':>8} "
+        f"{'cx':>8} {'fidelity':>9}"
+    )
+    for a, N in [(7, 15), (11, 53), (23, 221)]:
+        width = N.bit_length()
+        default = default_approximation_degree(width + 1)
+        for row in approximation_report(a, N, width, num_samples=4, seed=0):
+            marker = "*" if row["approximation_degree"] == default else ""
+            print(
+                f"{N:>6} {width:>6} {row['approximation_degree']:>6}{marker:1} "
+                f"{row['size']:>8} {row['depth']:>8} {row['cx']:>8} "
+                f"{row['fidelity']:>9.4f}"
+            )
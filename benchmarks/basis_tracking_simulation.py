@@ -0,0 +1,32 @@
+"""Measures the time per shot of Shor's circuit on `BasisTrackingSimulator`.
+
+For semiprimes N whose circuits need 11 to 33 qubits, simulates one shot of the
+semiclassical circuit. The populated basis states scale with the order r of a,
+which is reported alongside, while a statevector would hold 2^n amplitudes.
+"""
+
+import time
+
+from quantum.algorithms import Shor
+from quantum.simulators import BasisTrackingSimulator
+from quantum.simulators.order_finding_emulator import multiplicative_order
+
+CASES = [(15, 7), (21, 2), (7 * 13, 2), (31 * 37, 3), (127 * 131, 2)]
+
+
+def benchmark(N: int, a: int):
+    algorithm = Shor(N)
+    qc = algorithm._build_circuit(a)
+    simulator = BasisTrackingSimulator(seed=0)
+
+    start = time.perf_counter()
+    simulator.run_shot(qc)
+    return qc.num_qubits, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"{'N':>6} {'a':>3} {'r':>5} {'qubits':>7} {'time [s]':>9}")
+    for N, a in CASES:
+        qubits, seconds = benchmark(N, a)
+        r = multiplicative_order(a, N)
+        print(f"{N:>6} {a:>3} {r:>5} {qubits:>7} {seconds:>9.3f}")
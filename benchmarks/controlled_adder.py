@@ -0,0 +1,47 @@
+"""Compares the natively controlled Draper adder with qiskit's generic control().
+
+For several register widths, reports the construction time of the doubly-controlled
+PhiADD(a) gate and its size, depth and CX count after transpiling to a CX + U
+basis, once built via `AdditionGate.get_native().control(2)` and once with
+`num_controls=2`. With `apply_QFT`, the generic path also controls the QFTs.
+"""
+
+import time
+
+import qiskit as qk
+
+from quantum.gates import AdditionGate, GATE_CACHE
+
+
+def benchmark(width: int, apply_QFT: bool, native: bool):
+    GATE_CACHE.clear()
+    a = 2**width - 1
+
+    start = time.perf_counter()
+    if native:
+        gate = AdditionGate(a, width, apply_QFT, num_controls=2).get_native()
+    else:
+        gate = AdditionGate(a, width, apply_QFT).get_native().control(2)
+    gate.definition
+    construction_time = time.perf_counter() - start
+
+    qc = qk.QuantumCircuit(gate.num_qubits)
+    qc.append(gate, range(gate.num_qubits))
+    qct = qk.transpile(qc, basis_gates=["cx", "u"], optimization_level=1)
+    return construction_time, qct.size(), qct.depth(), qct.count_ops().get("cx", 0)
+
+
+if __name__ == "__main__":
+    print(
+        f"{'width':>6} {'QFT':>6} {'method':>8} {'time [s]':>10} "
+        f"{'size':>8} {'depth':>8} {'cx':>8}"
+    )
+    for apply_QFT in [False, True]:
+        for width in [4, 8, 12]:
+            for native in [False, True]:
+                construction_time, size, depth, cx = benchmark(width, apply_QFT, native)
+                method = "native" if native else "generic"
+                print(
+                    f"{width:>6} {str(apply_QFT):>6} {method:>8} "
+                    f"{construction_time:>10.4f} {size:>8} {depth:>8} {cx:>8}"
+                )
@@ -0,0 +1,47 @@
+"""Measures the throughput of Shor's classical pipeline on emulated circuits.
+
+For random semiprimes N of 30 to 60 bits, runs `Shor.run_batched` against
+`OrderFindingEmulator`, so no qubit is simulated. Reports the number of bases
+tried and the time per factorization. The static phase estimation is used,
+since building the semiclassical circuit with its L^2 / 2 conditioned
+rotations dominates the time otherwise.
+"""
+
+import random
+import time
+
+from quantum.algorithms import Shor
+from quantum.algorithms.prescreening import is_probable_prime
+from quantum.simulators import OrderFindingEmulator
+
+NUM_SHOTS = 4
+NUM_RUNS = 5
+
+
+def random_prime(bits: int, rng: random.Random) -> int:
+    while True:
+        p = rng.randrange(2 ** (bits - 1), 2**bits) | 1
+        if is_probable_prime(p):
+            return p
+
+
+def benchmark(bits: int, rng: random.Random):
+    attempts, elapsed = 0, 0.0
+    for run in range(NUM_RUNS):
+        N = random_prime(bits // 2, rng) * random_prime(bits - bits // 2, rng)
+        emulator = OrderFindingEmulator(shots=NUM_SHOTS, seed=run)
+        algorithm = Shor(N, phase_estimation=Shor.PhaseEstimation.Static)
+
+        start = time.perf_counter()
+        algorithm.run_batched(emulator.run_circuits, batch_size=4)
+        elapsed += time.perf_counter() - start
+        attempts += len(algorithm._tried_bases)
+    return attempts / NUM_RUNS, elapsed / NUM_RUNS
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    print(f"{'bits':>5} {'bases':>6} {'time [s]':>9}")
+    for bits in [30, 40, 50, 60]:
+        bases, seconds = benchmark(bits, rng)
+        print(f"{bits:>5} {bases:>6.1f} {seconds:>9.3f}")
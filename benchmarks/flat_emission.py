@@ -0,0 +1,50 @@
+"""Compares transpile times of Shor circuits built from nested and flat gates.
+
+For several N, builds the order finding circuit once with the multiplications
+appended as nested `to_gate()` boxes and once emitted via `emit_into`, then
+reports construction time, including the definitions of the appended gates, and
+transpile time for the Aer simulator together with the size of the transpiled
+circuit. The gate cache is cleared before every build.
+"""
+
+import time
+
+import qiskit as qk
+from qiskit_aer import AerSimulator
+
+from quantum.algorithms import Shor
+from quantum.gates import GATE_CACHE
+
+
+def _build_definitions(qc: qk.QuantumCircuit):
+    for instruction in qc.data:
+        definition = instruction.operation.definition
+        if definition is not None:
+            _build_definitions(definition)
+
+
+def benchmark(N: int, a: int, flat: bool):
+    GATE_CACHE.clear()
+    simulator = AerSimulator()
+
+    start = time.perf_counter()
+    qc = Shor(N, flat=flat)._build_circuit(a)
+    _build_definitions(qc)
+    construction_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    qct = qk.transpile(qc, backend=simulator)
+    transpile_time = time.perf_counter() - start
+    return construction_time, transpile_time, qct.size()
+
+
+if __name__ == "__main__":
+    print(f"{'N':>6} {'method':>8} {'build [s]':>10} {'transpile [s]':>14} {'size':>8}")
+    for N, a in [(15, 7), (21, 2), (35, 3), (55, 2)]:
+        for flat in [False, True]:
+            construction_time, transpile_time, size = benchmark(N, a, flat)
+            method = "flat" if flat else "nested"
+            print(
+                f"{N:>6} {method:>8} {construction_time:>10.3f} "
+                f"{transpile_time:>14.3f} {size:>8}"
+            )
@@ -0,0 +1,42 @@
+"""Compares the permutation and the Reed-Muller synthesis of AutoOracleGate.
+
+For random functions f:{0,1}^n -> {0,1}^m, reports the construction time of the
+native gate including its definition, the number of gates before transpilation
+and the CX count after transpiling to a CX + U basis.
+"""
+
+import time
+
+import numpy as np
+import qiskit as qk
+
+from quantum.gates import AutoOracleGate
+
+
+def benchmark(n: int, m: int, synthesis: AutoOracleGate.Synthesis, seed: int = 0):
+    truth_table = np.random.default_rng(seed).integers(0, 2**m, 2**n)
+    oracle = AutoOracleGate(lambda x: int(truth_table[x]), n, m, synthesis=synthesis)
+
+    start = time.perf_counter()
+    native = oracle.get_native()
+    native.definition
+    construction_time = time.perf_counter() - start
+
+    qc = qk.QuantumCircuit(native.num_qubits)
+    qc.append(native, range(native.num_qubits))
+    qct = qk.transpile(qc, basis_gates=["cx", "u"], optimization_level=0)
+
+    return construction_time, native.definition.size(), qct.count_ops().get("cx", 0)
+
+
+if __name__ == "__main__":
+    print(
+        f"{'n':>3} {'m':>3} {'synthesis':>12} {'time [s]':>10} {'gates':>8} {'cx':>8}"
+    )
+    for n, m in [(3, 1), (4, 2), (6, 1), (6, 3), (8, 1), (8, 2)]:
+        for synthesis in AutoOracleGate.Synthesis:
+            construction_time, size, cx = benchmark(n, m, synthesis)
+            print(
+                f"{n:>3} {m:>3} {synthesis.name:>12} {construction_time:>10.4f} "
+                f"{size:>8} {cx:>8}"
+            )
@@ -0,0 +1,77 @@
+"""Compares the corrections of the semiclassical QFT in Shor's circuit.
+
+For several N and bases a, builds the order finding circuit with a chain of
+conditioned rotations and with a single looked-up rotation per step, for several
+rotation thresholds. Reports the number of `if_test` blocks and of switch cases,
+the time to transpile and simulate the circuit on Aer, and the success
+probability, i.e. the fraction of shots whose outcome alone factors N. The lookup
+needs a positive threshold for N=21, see `Shor.MAX_LOOKUP_WINDOW`, so that
+combination is skipped. The lookup applies one rotation per step, but its
+switches hold far more cases than the chain has `if_test` blocks.
+"""
+
+import time
+
+import qiskit as qk
+from qiskit_aer import AerSimulator
+
+from quantum.algorithms import AlgorithmException, Prescreening, Shor
+
+NUM_SHOTS = 256
+
+
+def benchmark(N: int, a: int, correction: Shor.Correction, threshold: float):
+    simulator = AerSimulator()
+    algorithm = Shor(
+        N,
+        correction=correction,
+        correction_threshold=threshold,
+        prescreening=Prescreening(stages=[]),
+    )
+    qc = algorithm._build_circuit(a)
+    if_tests = qc.count_ops().get("if_else", 0)
+    cases = sum(
+        len(instruction.operation.blocks)
+        for instruction in qc.data
+        if instruction.operation.name == "switch_case"
+    )
+
+    start = time.perf_counter()
+    qct = qk.transpile(qc, backend=simulator)
+    counts = (
+        simulator.run(qct, shots=NUM_SHOTS, seed_simulator=0)
+        .result()
+        .get_counts()
+        .int_outcomes()
+    )
+    simulation_time = time.perf_counter() - start
+
+    successes = 0
+    for outcome, count in counts.items():
+        try:
+            algorithm._evaluate_counts(a, {outcome: count})
+            successes += count
+        except AlgorithmException:
+            pass
+    return if_tests, cases, simulation_time, successes / NUM_SHOTS
+
+
+if __name__ == "__main__":
+    print(
+        f"{'N':>4} {'a':>3} {'correction':>10} {'threshold':>10} "
+        f"{'if_test':>8} {'cases':>6} {'time [s]':>9} {'success':>8}"
+    )
+    for N, a in [(15, 7), (21, 2)]:
+        for correction in Shor.Correction:
+            for threshold in [0.0, 0.01, 0.1]:
+                try:
+                    if_tests, cases, simulation_time, success = benchmark(
+                        N, a, correction, threshold
+                    )
+                except ValueError:
+                    continue
+                print(
+                    f"{N:>4} {a:>3} {correction.name:>10} {threshold:>10} "
+                    f"{if_tests:>8} {cases:>6} {simulation_time:>9.3f} "
+                    f"{success:>8.3f}"
+                )
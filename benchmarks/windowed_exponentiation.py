@@ -0,0 +1,76 @@
+"""Compares windowed and plain modular exponentiation in the static Shor circuit.
+
+For moduli of several bit lengths n, estimates the static Shor circuit with
+exponent windows of w = 1 (one `CModularInplaceMultiplicationGate` per counting
+qubit) up to w = 4. Also estimates the exponentiation by w exponent bits with one
+windowed multiplication against w plain ones, for multiplicand windows m = 1
+and m = 2. Nothing is built for the estimates, so large n are cheap.
+
+Finally, builds the circuits for small N and reports depth and CX count after
+transpiling to a CX + U basis. The estimated depth counts every gate as one
+layer, while a lookup's multi-controlled X decomposes into many.
+"""
+
+import qiskit as qk
+
+from quantum.algorithms import Shor
+from quantum.gates import (
+    GATE_CACHE,
+    CModularInplaceMultiplicationGate,
+    WindowedModularMultiplicationGate,
+)
+
+
+def shor_estimate(n: int, window_size: int):
+    N = 2 ** (n - 1) + 1
+    algorithm = Shor(
+        N, phase_estimation=Shor.PhaseEstimation.Static, window_size=window_size
+    )
+    return algorithm.resource_estimate()
+
+
+def step_estimates(n: int, window: int, multiplicand_window: int):
+    N = 2 ** (n - 1) + 1
+    plain = CModularInplaceMultiplicationGate(1, N, n).resource_estimate() * window
+    windowed = WindowedModularMultiplicationGate(
+        1, N, n, window, multiplicand_window
+    ).resource_estimate()
+    return plain, windowed
+
+
+def transpiled(N: int, a: int, window_size: int):
+    GATE_CACHE.clear()
+    algorithm = Shor(
+        N, phase_estimation=Shor.PhaseEstimation.Static, window_size=window_size
+    )
+    qct = qk.transpile(algorithm._build_circuit(a), basis_gates=["cx", "u"])
+    return qct.depth(), qct.count_ops().get("cx", 0)
+
+
+if __name__ == "__main__":
+    print(f"{'n':>5} {'w':>3} {'size':>14} {'cx':>14} {'depth':>14}")
+    for n in [8, 32, 128]:
+        for window_size in [1, 2, 3, 4]:
+            estimate = shor_estimate(n, window_size)
+            print(
+                f"{n:>5} {window_size:>3} {estimate.size():>14} "
+                f"{estimate.cx_count():>14} {estimate.depth:>14}"
+            )
+
+    print()
+    print(f"{'n':>5} {'w':>3} {'m':>3} {'plain cx':>14} {'windowed cx':>14}")
+    for n in [8, 32, 128, 512]:
+        for window in [2, 3, 4]:
+            for multiplicand_window in [1, 2]:
+                plain, windowed = step_estimates(n, window, multiplicand_window)
+                print(
+                    f"{n:>5} {window:>3} {multiplicand_window:>3} "
+                    f"{plain.cx_count():>14} {windowed.cx_count():>14}"
+                )
+
+    print()
+    print(f"{'N':>5} {'w':>3} {'depth':>14} {'cx':>14}")
+    for N, a in [(15, 7), (21, 2), (35, 3), (55, 2)]:
+        for window_size in [1, 2, 3]:
+            depth, cx = transpiled(N, a, window_size)
+            print(f"{N:>5} {window_size:>3} {depth:>14} {cx:>14}")
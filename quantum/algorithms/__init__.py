@@ -1,4 +1,6 @@
 from quantum.algorithms.algorithm_exception import AlgorithmException
+from quantum.algorithms.prescreening import Prescreening
+from quantum.algorithms.order_postprocessing import OrderPostprocessing
 
 from quantum.algorithms.deutsch_jozsa import DeutschJozsa
 from quantum.algorithms.simons import Simons
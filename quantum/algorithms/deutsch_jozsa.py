@@ -29,12 +29,13 @@ class DeutschJozsa:
         return result
 
     def build_circuit(self) -> qk.QuantumCircuit:
-        qc = qk.QuantumCircuit(self.n + 1, self.n)
+        # Qubits of `f` beyond the n+1 working qubits are ancillas
+        qc = qk.QuantumCircuit(self.f.num_qubits, self.n)
 
         qc.x(self.n)
 
         qc.h(range(self.n + 1))
-        qc.append(self.f, range(self.n + 1))
+        qc.append(self.f, range(self.f.num_qubits))
         qc.h(range(self.n))
 
         qc.measure(range(self.n), range(self.n))
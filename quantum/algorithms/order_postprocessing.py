@@ -0,0 +1,102 @@
+from collections import defaultdict
+from fractions import Fraction
+from math import gcd, lcm
+
+from quantum.algorithms import AlgorithmException
+from quantum.algorithms.prescreening import primes_below
+
+
+class OrderPostprocessing:
+    def __init__(
+        self,
+        N: int,
+        L: int,
+        max_multiple: int = 4,
+        num_lcm_candidates: int = 4,
+        reduction_bound: int = 100,
+    ) -> None:
+        """Classical post-processing of the outcomes of ´L´-bit order finding mod ´N´.
+
+        Every outcome y approximates k / r * 2^L for the order r and a random k. The
+        denominators of all exact convergents of y / 2^L below N are candidates for
+        r, weighted by the counts of the outcomes producing them. Since k and r may
+        share a factor, the multiples up to ´max_multiple´ of every denominator and
+        the LCMs of the ´num_lcm_candidates´ heaviest denominators are candidates
+        as well. They are tested in the order of their weight using modular
+        exponentiation only, and the first one with a^r = 1 mod N is reduced by the
+        primes below ´reduction_bound´ towards the order of a.
+        """
+        self.N = N
+        self.L = L
+        self.max_multiple = max_multiple
+        self.num_lcm_candidates = num_lcm_candidates
+        self.reduction_bound = reduction_bound
+
+    def ranked_candidates(self, counts: dict[int, int]) -> list[tuple[int, int]]:
+        """Returns all candidates for the order with their weights, heaviest first"""
+        weights = defaultdict(int)
+        for outcome, count in counts.items():
+            for convergent in convergents(outcome, 2**self.L, self.N - 1):
+                if convergent.denominator > 1:
+                    weights[convergent.denominator] += count
+
+        candidates = dict(weights)
+
+        def add(r, weight):
+            if r < self.N:
+                candidates[r] = max(candidates.get(r, 0), weight)
+
+        for r, weight in weights.items():
+            for k in range(2, self.max_multiple + 1):
+                add(k * r, weight)
+
+        heaviest = sorted(weights, key=lambda r: (-weights[r], r))
+        heaviest = heaviest[: self.num_lcm_candidates]
+        for i, r in enumerate(heaviest):
+            for s in heaviest[i + 1 :]:
+                add(lcm(r, s), weights[r] + weights[s])
+
+        return sorted(candidates.items(), key=lambda item: (-item[1], item[0]))
+
+    def find_order(self, a: int, counts: dict[int, int]) -> int | None:
+        """Returns the order of ´a´ mod N if the outcomes in ´counts´ reveal it"""
+        for r, _ in self.ranked_candidates(counts):
+            if pow(a, r, self.N) == 1:
+                return self._reduce_order(a, r)
+        return None
+
+    def factors(self, a: int, counts: dict[int, int]) -> tuple[int, int]:
+        """Returns a non-trivial factorization of N from the order of ´a´ found in
+        ´counts´. Raises an ´AlgorithmException´ if there is none."""
+        r = self.find_order(a, counts)
+        if r is None or r % 2 != 0:
+            raise AlgorithmException
+
+        x = pow(a, r // 2, self.N)
+        if x == self.N - 1:
+            raise AlgorithmException
+
+        # Since x^2 = 1 but x != +-1 mod N, both gcds are non-trivial
+        divisor = gcd(x + 1, self.N)
+        return (divisor, self.N // divisor)
+
+    def _reduce_order(self, a: int, r: int) -> int:
+        for p in primes_below(self.reduction_bound):
+            while r % p == 0 and pow(a, r // p, self.N) == 1:
+                r //= p
+        return r
+
+
+def convergents(numerator: int, denominator: int, max_denominator: int):
+    """Yields the convergents of the continued fraction of numerator / denominator
+    with denominators up to ´max_denominator´, computed with exact integers"""
+    h_prev, h = 0, 1
+    k_prev, k = 1, 0
+    while denominator:
+        quotient, remainder = divmod(numerator, denominator)
+        h_prev, h = h, quotient * h + h_prev
+        k_prev, k = k, quotient * k + k_prev
+        if k > max_denominator:
+            return
+        yield Fraction(h, k)
+        numerator, denominator = denominator, remainder
@@ -0,0 +1,211 @@
+import time
+
+from enum import Enum
+from collections import Counter
+from math import gcd
+from random import randint
+from functools import lru_cache
+
+
+class Prescreening:
+    class Stage(Enum):
+        TrialDivision = 1
+        PerfectPower = 2
+        Primality = 3
+        LuckyGcd = 4
+
+    def __init__(
+        self,
+        stages: list[Stage] | None = None,
+        trial_division_bound: int = 1000,
+        primality_rounds: int = 16,
+    ) -> None:
+        """Classical checks run by ´Shor´ before any circuit is built.
+
+        ´factorize´ runs the enabled ´stages´ in order: trial division by all primes
+        below ´trial_division_bound´, detection of perfect powers via integer roots
+        and a Miller-Rabin primality test, deterministic below 3.3 * 10^24 and with
+        ´primality_rounds´ random bases above. ´Stage.LuckyGcd´ lets ´Shor´ return
+        the factor found by gcd(a, N) != 1 for a random base a.
+
+        For every stage, ´timings´ accumulates the seconds spent in it and ´hits´
+        counts how often it decided the result, by a factor or by proving N prime.
+        """
+        if stages is None:
+            stages = list(Prescreening.Stage)
+
+        self.stages = stages
+        self.trial_division_bound = trial_division_bound
+        self.primality_rounds = primality_rounds
+        self.timings = {stage: 0.0 for stage in Prescreening.Stage}
+        self.hits = {stage: 0 for stage in Prescreening.Stage}
+
+    def factorize(self, N: int) -> tuple[int, int] | None:
+        """Returns a non-trivial factorization of ´N´ if one of the stages finds one,
+        or None if ´N´ needs the quantum algorithm. Raises a ´ValueError´ if ´N´ is
+        prime."""
+        if N < 4:
+            raise ValueError(f"{N} has no non-trivial factorization")
+
+        checks = [
+            (Prescreening.Stage.TrialDivision, self._trial_division),
+            (Prescreening.Stage.PerfectPower, Prescreening._perfect_power),
+            (Prescreening.Stage.Primality, self._check_composite),
+        ]
+        for stage, check in checks:
+            if stage not in self.stages:
+                continue
+
+            start = time.perf_counter()
+            try:
+                factors = check(N)
+            except ValueError:
+                self.hits[stage] += 1
+                raise
+            finally:
+                self.timings[stage] += time.perf_counter() - start
+
+            if factors is not None:
+                self.hits[stage] += 1
+                return factors
+        return None
+
+    def lucky_gcd(self, a: int, N: int) -> tuple[int, int] | None:
+        """Returns the factorization given by gcd(a, N) if it is non-trivial"""
+        if Prescreening.Stage.LuckyGcd not in self.stages:
+            return None
+
+        start = time.perf_counter()
+        divisor = gcd(a, N)
+        self.timings[Prescreening.Stage.LuckyGcd] += time.perf_counter() - start
+        if 1 < divisor < N:
+            self.hits[Prescreening.Stage.LuckyGcd] += 1
+            return (divisor, N // divisor)
+        return None
+
+    def _trial_division(self, N: int) -> tuple[int, int] | None:
+        for p in primes_below(self.trial_division_bound):
+            if p * p > N:
+                raise ValueError(f"{N} is prime")
+            if N % p == 0:
+                return (p, N // p)
+        return None
+
+    def _perfect_power(N: int) -> tuple[int, int] | None:
+        for k in range(2, N.bit_length() + 1):
+            root = integer_root(N, k)
+            if root > 1 and root**k == N:
+                return (root, N // root)
+        return None
+
+    def _check_composite(self, N: int) -> None:
+        if is_probable_prime(N, self.primality_rounds):
+            raise ValueError(f"{N} is prime")
+        return None
+
+
+# The Miller-Rabin test with these bases is deterministic for n < 3.3 * 10^24
+_DETERMINISTIC_BASES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+
+
+def is_probable_prime(n: int, rounds: int = 16) -> bool:
+    """Miller-Rabin test, exact for n < 3.3 * 10^24"""
+    if n < 2:
+        return False
+    for p in _DETERMINISTIC_BASES:
+        if n % p == 0:
+            return n == p
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    bases = _DETERMINISTIC_BASES
+    if n >= 3_317_044_064_679_887_385_961_981:
+        bases = bases + [randint(2, n - 2) for _ in range(rounds)]
+
+    for base in bases:
+        x = pow(base, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def integer_root(n: int, k: int) -> int:
+    """Returns the largest integer r with r^k <= n"""
+    if n < 2:
+        return n
+    # Newton's method from above, starting at a power of two >= the root
+    root = 1 << -(-n.bit_length() // k)
+    while True:
+        next_root = ((k - 1) * root + n // root ** (k - 1)) // k
+        if next_root >= root:
+            return root
+        root = next_root
+
+
+def prime_factorization(n: int) -> dict[int, int]:
+    """Returns the primes dividing n with their multiplicities"""
+    factors = Counter()
+    for p in primes_below(1000):
+        while n % p == 0:
+            factors[p] += 1
+            n //= p
+
+    remaining = [n] if n > 1 else []
+    while remaining:
+        m = remaining.pop()
+        if is_probable_prime(m):
+            factors[m] += 1
+        else:
+            divisor = pollard_rho(m)
+            remaining += [divisor, m // divisor]
+    return dict(factors)
+
+
+def pollard_rho(n: int) -> int:
+    """Returns a non-trivial divisor of the odd composite n, using Brent's variant
+    of Pollard's rho method"""
+    for c in range(1, n):
+        y, r, q, divisor = 2, 1, 1, 1
+        while divisor == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and divisor == 1:
+                saved = y
+                for _ in range(min(128, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                divisor = gcd(q, n)
+                k += 128
+            r *= 2
+
+        if divisor == n:
+            # The batched gcd overshot, retrace the last batch step by step
+            divisor = 1
+            while divisor == 1:
+                saved = (saved * saved + c) % n
+                divisor = gcd(abs(x - saved), n)
+        if divisor != n:
+            return divisor
+    raise ValueError(f"{n} is prime")
+
+
+@lru_cache
+def primes_below(bound: int) -> list[int]:
+    """Returns all primes p < bound, by the sieve of Eratosthenes"""
+    sieve = bytearray([1]) * bound
+    sieve[:2] = b"\x00\x00"
+    for p in range(2, int(bound**0.5) + 1):
+        if sieve[p]:
+            sieve[p * p :: p] = bytearray(len(range(p * p, bound, p)))
+    return [p for p in range(bound) if sieve[p]]
@@ -1,31 +1,153 @@
 import numpy as np
 from math import gcd
+from functools import lru_cache
 
 from random import randint
-from fractions import Fraction
 
 import qiskit as qk
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
+from concurrent.futures import (
+    CancelledError,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+    FIRST_COMPLETED,
+)
+from threading import Event, RLock
+import multiprocessing
+from enum import Enum
 
-from sympy import evaluate
-
-from quantum.algorithms import AlgorithmException
-from quantum.gates import CModularInplaceMultiplicationGate
+from quantum.algorithms import AlgorithmException, OrderPostprocessing, Prescreening
+from quantum.gates import (
+    CModularInplaceMultiplicationGate,
+    WindowedModularMultiplicationGate,
+    append_qft,
+    cancel_qft_pairs,
+)
+from quantum.gates.qft import qft_resource_estimate
+from quantum.resources import ResourceEstimate
 
 
 class Shor:
-    def __init__(self, N: int):
+    class PhaseEstimation(Enum):
+        Semiclassical = 1
+        Static = 2
+
+    class Correction(Enum):
+        Chain = 1
+        Lookup = 2
+
+    # ´Correction.Lookup´ switches over 2^window - 1 cases in every step
+    MAX_LOOKUP_WINDOW = 8
+
+    def __init__(
+        self,
+        N: int,
+        approximation_degree: int = 0,
+        cancel_qfts: bool = False,
+        flat: bool = False,
+        parameterized: bool = False,
+        transpile: Callable[[qk.QuantumCircuit], qk.QuantumCircuit] | None = None,
+        prescreening: Prescreening | None = None,
+        correction: Correction = Correction.Chain,
+        correction_threshold: float = 0.0,
+        phase_estimation: PhaseEstimation = PhaseEstimation.Semiclassical,
+        num_counting_qubits: int | None = None,
+        window_size: int = 1,
+    ):
+        """With a positive ´approximation_degree´, the QFTs and adders inside the
+        modular multiplications drop their smallest rotations, see ´qft_gate´.
+
+        With ´cancel_qfts´, the circuit is inlined down to its QFTs and the
+        QFT/QFT-inverse pairs between consecutive multiplications are removed. The
+        number of QFTs removed from every multiplication gate is kept in
+        ´removed_qfts´, keyed by the index of the gate in the uncancelled circuit.
+
+        With ´flat´, the multiplications are emitted as primitive operations instead
+        of nested gates, which saves the transpiler from unrolling them.
+
+        With ´parameterized´, the circuit is built only once per N, with parameters
+        in place of the constants derived from the base a. Every attempt then only
+        binds their values. This requires the exact arithmetic. If ´transpile´ is
+        given, it is applied to every circuit before it is run, or just once to the
+        parameterized circuit.
+
+        Before any circuit is built, the classical checks of ´prescreening´ are run
+        on N, by default all of them, see ´Prescreening´. The measured outcomes are
+        evaluated by ´OrderPostprocessing´.
+
+        Before every measurement, the semiclassical QFT rotates the control qubit by
+        -2 pi / 2^(d+1) for every previous bit measured as 1, d steps earlier.
+        Rotations by less than ´correction_threshold´ are dropped, which limits the
+        corrections to a window of the last few bits. ´Correction.Chain´ applies
+        one conditioned rotation per bit in the window. ´Correction.Lookup´ copies
+        every measured bit into a cyclic ´window´ register and applies a single
+        rotation per step, looked up by the value of that register. Its switch has
+        2^window - 1 cases, so windows above ´MAX_LOOKUP_WINDOW´ raise a
+        ´ValueError´ and N > 16 needs a positive ´correction_threshold´ for it.
+
+        ´PhaseEstimation.Static´ builds a circuit without any mid-circuit
+        measurement, reset or condition instead, for simulators which favour
+        static circuits. It estimates the phase in a register of
+        ´num_counting_qubits´ qubits, by default 2n, followed by an inverse QFT.
+        The corrections only apply to ´PhaseEstimation.Semiclassical´.
+
+        With a ´window_size´ w > 1, the static circuit multiplies by a^(k 2^j) for
+        w counting qubits k at once, see ´WindowedModularMultiplicationGate´. This
+        needs L / w instead of L multiplications, n more ancillas and the exact
+        arithmetic. The lookups grow with 2^w, so w = 2 gives the smallest circuits
+        for small N, see ´benchmarks/windowed_exponentiation.py´."""
+        if parameterized and approximation_degree > 0:
+            raise ValueError("A parameterized circuit can not be approximated")
+        if window_size > 1 and (
+            phase_estimation is not Shor.PhaseEstimation.Static
+            or parameterized
+            or approximation_degree > 0
+        ):
+            raise ValueError(
+                "Windows need the static phase estimation and the exact arithmetic"
+            )
+
         self.N = N
-        self.L = None
+        self.approximation_degree = approximation_degree
+        self.cancel_qfts = cancel_qfts
+        self.flat = flat
+        self.parameterized = parameterized
+        self.transpile = transpile
+        self.correction = correction
+        self.correction_threshold = correction_threshold
+        self.phase_estimation = phase_estimation
+        self.num_counting_qubits = num_counting_qubits
+        self.window_size = window_size
+        self.prescreening = Prescreening() if prescreening is None else prescreening
+        self.postprocessing = OrderPostprocessing(N, self._num_counting_bits())
+        self.removed_qfts = None
+        self.L = self._num_counting_bits()
+        self._template = None
+        self._tried_bases = set()
+        # Guards the template, ´removed_qfts´ and the prescreening statistics
+        # against concurrent attempts. Reentrant, since the template is built
+        # with the lock held.
+        self._lock = RLock()
+
+        if (
+            correction is Shor.Correction.Lookup
+            and phase_estimation is Shor.PhaseEstimation.Semiclassical
+            and self._correction_window() > Shor.MAX_LOOKUP_WINDOW
+        ):
+            raise ValueError(
+                "The lookup correction needs a correction_threshold above "
+                f"{-_correction_angle(Shor.MAX_LOOKUP_WINDOW + 1):.2g}"
+            )
 
     def run(
         self, run_circuit: Callable[[qk.QuantumCircuit], dict[int, int]]
     ) -> tuple[int, int]:
-        if self.N % 2 == 0:
-            return (2, int(self.N / 2))
+        if (factors := self._classical_factors()) is not None:
+            return factors
 
-        # TODO: Test that N is not a power of primes
         while True:
             a = randint(3, self.N - 1)
             try:
@@ -35,83 +157,456 @@ class Shor:
                 continue
         return result
 
+    def run_batched(
+        self,
+        run_circuits: Callable[[list[qk.QuantumCircuit]], Iterable[dict[int, int]]],
+        batch_size: int = 8,
+    ) -> tuple[int, int]:
+        """Like ´run´, but draws ´batch_size´ distinct bases at once and passes their
+        circuits as one list to ´run_circuits´. It returns or yields the counts of
+        the circuits in the same order, and every result is evaluated as soon as it
+        arrives. No base is tried twice over the lifetime of the instance, so this
+        raises an ´AlgorithmException´ once all bases failed."""
+        if (factors := self._classical_factors()) is not None:
+            return factors
+
+        while bases := self._draw_bases(batch_size):
+            for a in bases:
+                if (factors := self.prescreening.lucky_gcd(a, self.N)) is not None:
+                    return factors
+            bases = [a for a in bases if gcd(a, self.N) == 1]
+            circuits = [self._build_circuit(a) for a in bases]
+            for a, counts in zip(bases, run_circuits(circuits)):
+                try:
+                    return self._evaluate_counts(a, counts)
+                except AlgorithmException:
+                    continue
+        raise AlgorithmException
+
+    def run_concurrent(
+        self,
+        run_circuit: Callable[[qk.QuantumCircuit], dict[int, int]],
+        max_workers: int = 4,
+        executor: Executor | None = None,
+        processes: bool = False,
+    ) -> tuple[int, int]:
+        """Like ´run´, but keeps ´max_workers´ attempts with distinct bases running
+        concurrently. Failed attempts are replaced by new ones. Once an attempt
+        returns factors, all other attempts are cancelled and no attempt keeps
+        running after the call returned.
+
+        By default, the attempts run in a thread pool. A thread can not be
+        interrupted inside ´run_circuit´, so the other attempts stop at their next
+        check before or after it, and the call waits for them. With ´processes´, the
+        attempts run in a process pool instead, whose workers are terminated at
+        once. Another executor can be passed as ´executor´, e.g. a process pool if
+        ´run_circuit´ and this instance can be pickled. It is not shut down, but the
+        call also waits for its attempts to stop."""
+        if (factors := self._classical_factors()) is not None:
+            return factors
+
+        own_executor = executor is None
+        if own_executor:
+            if processes:
+                executor = ProcessPoolExecutor(max_workers)
+            else:
+                executor = ThreadPoolExecutor(max_workers)
+
+        manager = None
+        if isinstance(executor, ThreadPoolExecutor):
+            cancelled = Event()
+        else:
+            # Other executors may run the attempts in other processes
+            manager = multiprocessing.Manager()
+            cancelled = manager.Event()
+
+        pending = set()
+
+        def submit():
+            for a in self._draw_bases(1):
+                pending.add(
+                    executor.submit(self._run_single_pass, a, run_circuit, cancelled)
+                )
+
+        try:
+            for _ in range(max_workers):
+                submit()
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result = future.result()
+                    except AlgorithmException:
+                        submit()
+                        continue
+                    return result
+            raise AlgorithmException
+        finally:
+            cancelled.set()
+            for attempt in pending:
+                attempt.cancel()
+            if own_executor and processes:
+                _terminate_workers(executor)
+            if own_executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+            else:
+                wait(pending)
+            if manager is not None:
+                manager.shutdown()
+
+    def _classical_factors(self) -> tuple[int, int] | None:
+        if self.N % 2 == 0:
+            return (2, self.N // 2)
+        return self.prescreening.factorize(self.N)
+
+    def _draw_bases(self, k: int) -> list[int]:
+        """Draws up to ´k´ random bases 3 <= a < N that were not drawn before. Only
+        returns an empty list once all bases were tried."""
+        bases = []
+        while len(bases) < k and len(self._tried_bases) < self.N - 3:
+            a = randint(3, self.N - 1)
+            if a not in self._tried_bases:
+                self._tried_bases.add(a)
+                bases.append(a)
+        return bases
+
     def _run_single_pass(
-        self, a: int, run_circuit: Callable[[qk.QuantumCircuit], dict[int, int]]
+        self,
+        a: int,
+        run_circuit: Callable[[qk.QuantumCircuit], dict[int, int]],
+        cancelled: Event | None = None,
     ) -> tuple[int, int]:
-        trivial_guess = gcd(a, self.N)
-        if trivial_guess != 1:
-            print("Guessed a non trivial divisor!")
-            # return (trivial_guess, int(self.N / trivial_guess))
+        """Runs the attempt with the base ´a´. If ´cancelled´ is set, e.g. by
+        ´run_concurrent´, the attempt raises a ´CancelledError´ at its next check,
+        before building the circuit and before and after running it."""
+
+        def check_cancelled():
+            if cancelled is not None and cancelled.is_set():
+                raise CancelledError
+
+        check_cancelled()
+        with self._lock:
+            factors = self.prescreening.lucky_gcd(a, self.N)
+        if factors is not None:
+            return factors
+        if gcd(a, self.N) != 1:
             raise AlgorithmException
 
         qc = self._build_circuit(a)
-        qc_result_counts = run_circuit(qc)
-        guesses = self._extract_guesses(qc_result_counts)
+        check_cancelled()
+        counts = run_circuit(qc)
+        check_cancelled()
+        return self._evaluate_counts(a, counts)
+
+    def _evaluate_counts(
+        self, a: int, qc_result_counts: dict[int, int]
+    ) -> tuple[int, int]:
+        # With ´Correction.Lookup´, the outcomes contain the window register
+        # above the measured bits
+        mask = 2 ** self._num_counting_bits() - 1
+        counts = {}
+        for outcome, count in qc_result_counts.items():
+            counts[outcome & mask] = counts.get(outcome & mask, 0) + count
+        return self.postprocessing.factors(a, counts)
 
-        result = None
+    def resource_estimate(self) -> ResourceEstimate:
+        """Upper bound on the resources of the circuit built by ´_build_circuit´,
+        independent of ´a´, without building it"""
+        n = self._num_bits()
+        L = self._num_counting_bits()
+        # The estimate of the multiplication does not depend on the factor
+        mult = CModularInplaceMultiplicationGate(
+            1, self.N, n, self.approximation_degree
+        )
 
-        for guess in guesses:
-            if a**guess % self.N == 1:
-                try:
-                    result = self._evaluate_guess(a, guess)
-                except AlgorithmException:
-                    break
+        num_steps = L
+        if self.window_size > 1:
+            # The estimate of the windowed multiplication only depends on the size
+            # of the window, the last window may be smaller
+            num_steps = -(-L // self.window_size)
+            last_window = L - (num_steps - 1) * self.window_size
+            mult = WindowedModularMultiplicationGate(1, self.N, n, self.window_size)
+            last_mult = WindowedModularMultiplicationGate(1, self.N, n, last_window)
 
-        if result is not None:
-            return result
+        if self.phase_estimation is Shor.PhaseEstimation.Static:
+            num_qubits = L + 2 * n + 2
+            if self.window_size > 1:
+                num_qubits += n
+            estimate = ResourceEstimate(num_qubits, {"h": L, "x": 1}, depth=1)
+            if self.window_size > 1:
+                estimate += mult.resource_estimate() * (num_steps - 1)
+                estimate += last_mult.resource_estimate()
+            else:
+                estimate += mult.resource_estimate() * L
+            estimate += qft_resource_estimate(L)
+            estimate += ResourceEstimate(num_qubits, {"measure": L}, depth=1)
         else:
-            raise AlgorithmException
+            estimate = ResourceEstimate(2 * n + 3, {"h": 1, "x": 1}, depth=1)
+            estimate += mult.resource_estimate() * L
+            estimate += self._correction_resource_estimate()
+
+        if self.cancel_qfts:
+            estimate -= qft_resource_estimate(n + 1, self.approximation_degree) * (
+                2 * (num_steps - 1)
+            )
+        return estimate
+
+    def _correction_resource_estimate(self) -> ResourceEstimate:
+        n = self._num_bits()
+        L = self._num_counting_bits()
+        # Phase corrections conditioned on the previous measurements, followed by
+        # the measurement and the reset of the control qubit
+        window = self._correction_window()
+        if self.correction is Shor.Correction.Lookup:
+            # Every case of the switch holds one rotation, of which one is applied
+            corrections = {
+                "rz": sum(len(_correction_table(bit, window)) for bit in range(L)),
+                "store": L if window > 0 else 0,
+            }
+            depth = L - 1
+        else:
+            corrections = {"rz": sum(min(bit, window) for bit in range(L))}
+            depth = corrections["rz"]
+        estimate = ResourceEstimate(
+            2 * n + 3,
+            {"h": 2 * L, "measure": L, "reset": L},
+            depth=depth + 4 * L,
+        )
+        return estimate + ResourceEstimate(2 * n + 3, corrections)
+
+    def _correction_window(self) -> int:
+        """Returns the number of previous bits corrected in every step"""
+        L = self._num_counting_bits()
+        window = 0
+        while window < L - 1 and _correction_angle(window + 1) <= -(
+            self.correction_threshold
+        ):
+            window += 1
+        return window
+
+    def _num_bits(self) -> int:
+        return (self.N - 1).bit_length()
+
+    def _num_counting_bits(self) -> int:
+        """Returns the number L of bits of the estimated phase"""
+        if (
+            self.phase_estimation is Shor.PhaseEstimation.Static
+            and self.num_counting_qubits is not None
+        ):
+            return self.num_counting_qubits
+        return 2 * self._num_bits()
 
     def _build_circuit(self, a: int) -> qk.QuantumCircuit:
-        n = int(np.ceil(np.log2(self.N)))
-        self.L = 2 * n
+        """Builds the order finding circuit for the base ´a´. Its metadata holds
+        ´a´, N and the number L of measured bits, e.g. for ´OrderFindingEmulator´."""
+        n = self._num_bits()
+        factors, _ = self.exponent_schedule(a)
+
+        if self.parameterized:
+            template, parameters = self._get_template()
+            values = {}
+            for bit, factor in enumerate(factors):
+                values.update(
+                    zip(
+                        parameters[bit],
+                        CModularInplaceMultiplicationGate.parameter_values(
+                            factor, self.N, n
+                        ),
+                    )
+                )
+            qc = template.assign_parameters(values)
+        else:
+            qc = self._build_order_finding_circuit(factors)
+            if self.transpile:
+                qc = self.transpile(qc)
+
+        qc.metadata = {"a": a, "N": self.N, "L": self._num_counting_bits()}
+        return qc
+
+    def _get_template(self) -> tuple[qk.QuantumCircuit, list]:
+        """Returns the (transpiled) parameterized circuit and, for every step, the
+        parameters of its modular multiplication"""
+        with self._lock:
+            if self._template is None:
+                parameters = [
+                    qk.circuit.ParameterVector(f"a_{bit}", 2 * self._num_bits())
+                    for bit in range(self._num_counting_bits())
+                ]
+                qc = self._build_order_finding_circuit(parameters)
+                if self.transpile:
+                    qc = self.transpile(qc)
+                self._template = (qc, parameters)
+            return self._template
+
+    def exponent_schedule(self, a: int) -> tuple[list[int], list[int]]:
+        """Returns the factors a^(2^(L-1-bit)) mod N multiplied in the steps of the
+        circuit, together with the steps whose factor is 1 and which are skipped.
+        The schedule is computed with Python integers and cached per (a, N)."""
+        factors = _exponent_schedule(a, self.N, self._num_counting_bits())
+        return list(factors), [bit for bit, factor in enumerate(factors) if factor == 1]
+
+    def _build_order_finding_circuit(self, factors: list) -> qk.QuantumCircuit:
+        """Builds the order finding circuit. Every factor is either an integer or
+        the parameters of ´CModularInplaceMultiplicationGate´."""
+        if self.phase_estimation is Shor.PhaseEstimation.Static:
+            qc = self._build_static_circuit(factors)
+        else:
+            qc = self._build_semiclassical_circuit(factors)
+
+        if self.cancel_qfts:
+            qc, removed_qfts = cancel_qft_pairs(qc)
+            with self._lock:
+                self.removed_qfts = removed_qfts
+
+        return qc
+
+    def _append_multiplication(
+        self, qc: qk.QuantumCircuit, factor, control, b_reg, ancilla_reg
+    ) -> None:
+        mult = CModularInplaceMultiplicationGate(
+            factor, self.N, self._num_bits(), self.approximation_degree
+        )
+        self._append_gate(qc, mult, [control] + b_reg[:] + ancilla_reg[:])
+
+    def _append_gate(self, qc: qk.QuantumCircuit, gate, qubits: list) -> None:
+        if self.flat:
+            gate.emit_into(qc, qubits)
+        else:
+            qc.append(gate.get_native(), qubits)
+
+    def _build_static_circuit(self, factors: list) -> qk.QuantumCircuit:
+        n = self._num_bits()
+        counting_reg = qk.circuit.QuantumRegister(self.L, "counting")
+        b_reg = qk.circuit.QuantumRegister(n, "b")
+        # Windows need n more ancillas for the lookup register
+        num_ancillas = 2 * n + 2 if self.window_size > 1 else n + 2
+        ancilla_reg = qk.circuit.AncillaRegister(num_ancillas, "a")
+        meas_reg = qk.circuit.ClassicalRegister(self.L)
+        qc = qk.QuantumCircuit(counting_reg, b_reg, ancilla_reg, meas_reg)
+
+        # Start the work register in |1>
+        qc.h(counting_reg)
+        qc.x(b_reg[0])
+
+        if self.window_size > 1:
+            for offset in range(0, self.L, self.window_size):
+                window = counting_reg[offset : offset + self.window_size]
+                # Multiplies by (a^(2^offset))^k for the value k of the window
+                factor = factors[self.L - 1 - offset]
+                if factor == 1:
+                    continue
+                mult = WindowedModularMultiplicationGate(factor, self.N, n, len(window))
+                self._append_gate(qc, mult, window + b_reg[:] + ancilla_reg[:])
+        else:
+            for bit in range(self.L):
+                if isinstance(factors[bit], int) and factors[bit] == 1:
+                    continue
+                # The multiplication by a^(2^k) is controlled by the k-th counting
+                # qubit
+                self._append_multiplication(
+                    qc,
+                    factors[bit],
+                    counting_reg[self.L - 1 - bit],
+                    b_reg,
+                    ancilla_reg,
+                )
+
+        append_qft(qc, counting_reg, inverse=True)
+        qc.measure(counting_reg, meas_reg)
+        return qc
+
+    def _build_semiclassical_circuit(self, factors: list) -> qk.QuantumCircuit:
+        n = self._num_bits()
         x_reg = qk.circuit.QuantumRegister(1, "x")
         b_reg = qk.circuit.QuantumRegister(n, "b")
         ancilla_reg = qk.circuit.AncillaRegister(n + 2, "a")
         meas_reg = qk.circuit.ClassicalRegister(self.L)
         qc = qk.QuantumCircuit(x_reg, b_reg, ancilla_reg, meas_reg)
-        qc.h(x_reg)
-        qc.x(b_reg)
+        window = self._correction_window()
+        window_reg = None
+        if self.correction is Shor.Correction.Lookup and window > 0:
+            window_reg = qk.circuit.ClassicalRegister(window, "window")
+            qc.add_register(window_reg)
 
-        factors = np.empty(self.L, dtype=int)
-        factors[0] = a
-        for bit in range(1, self.L):
-            factors[bit] = (factors[bit - 1] * factors[bit - 1]) % self.N
-        factors = factors[::-1]
+        # Start the work register in |1>
+        qc.h(x_reg)
+        qc.x(b_reg[0])
 
         for bit in range(self.L):
-            if factors[bit] == 1:
+            if isinstance(factors[bit], int) and factors[bit] == 1:
+                # The steps with a^(2^k) = 1 form a prefix and always measure 0
                 continue
 
-            mult = CModularInplaceMultiplicationGate(int(factors[bit]), self.N, n)
-            qc.append(mult.get_native(), [x_reg[0]] + b_reg[:] + ancilla_reg[:])
-            for j in range(bit):
-                theta = -2 * np.pi / (2 ** (j + 2))  # (bit - j + 1))
-                with qc.if_test((meas_reg[j], 1)):
-                    qc.rz(theta, x_reg)
+            self._append_multiplication(qc, factors[bit], x_reg[0], b_reg, ancilla_reg)
+
+            if window_reg is not None:
+                table = _correction_table(bit, window)
+                if table:
+                    with qc.switch(window_reg) as case:
+                        for value, theta in table:
+                            with case(value):
+                                qc.rz(theta, x_reg)
+            else:
+                for j in range(max(0, bit - window), bit):
+                    with qc.if_test((meas_reg[j], 1)):
+                        qc.rz(_correction_angle(bit - j), x_reg)
             qc.h(x_reg)
             qc.measure(x_reg, meas_reg[bit])
+            if window_reg is not None:
+                qc.store(window_reg[bit % window], meas_reg[bit])
 
             qc.reset(x_reg)
             qc.h(x_reg)
 
         return qc
 
-    def _extract_guesses(self, outcomes: dict[int, int]) -> list[int]:
-        guesses = []
-        for outcome in {k: v for k, v in outcomes.items() if k not in [0, 1]}:
-            phase = outcome / (pow(2, self.L))
-            frac = Fraction(phase).limit_denominator(self.N)
-            guesses.append(frac.denominator)
-        return guesses
+    def __getstate__(self) -> dict:
+        # Locks can not be pickled, e.g. for a process pool in ´run_concurrent´
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
 
-    def _evaluate_guess(self, a: int, guess: int) -> bool:
-        if guess % 2 != 0 or (a ** int(guess / 2) + 1) % self.N == 0:
-            raise AlgorithmException
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = RLock()
+
+
+def _terminate_workers(executor: ProcessPoolExecutor) -> None:
+    if hasattr(executor, "terminate_workers"):
+        executor.terminate_workers()
+        return
+    # Before Python 3.14, the pool has no public way to stop running tasks
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+
+
+@lru_cache
+def _exponent_schedule(a, N, L):
+    factors = [a % N]
+    for _ in range(1, L):
+        factors.append(factors[-1] * factors[-1] % N)
+    return tuple(reversed(factors))
 
-        d1 = gcd(a ** int(guess / 2) + 1, self.N)
-        d2 = gcd(a ** int(guess / 2) - 1, self.N)
-        if d1 * d2 == self.N:
-            return (d1, d2)
+
+def _correction_angle(distance):
+    return -2 * np.pi * 2.0 ** -(distance + 1)
+
+
+@lru_cache
+def _correction_table(bit, window):
+    """Returns the combined correction of step ´bit´ for every value of the cyclic
+    window register, skipping values with unmeasured bits and zero angles"""
+    table = []
+    for value in range(1, 2**window):
+        theta = 0
+        for index in range(window):
+            if value >> index & 1:
+                # The previous step stored at ´index´
+                j = bit - 1 - (bit - 1 - index) % window
+                if j < 0:
+                    break
+                theta += _correction_angle(bit - j)
         else:
-            raise AlgorithmException
+            table.append((value, theta))
+    return table
@@ -17,9 +17,10 @@ class Simons:
         self.qc = None
 
     def build_circuit(self) -> qk.QuantumCircuit:
-        qc = qk.QuantumCircuit(self.n + self.m, self.n)
+        # Qubits of `f` beyond the n+m working qubits are ancillas
+        qc = qk.QuantumCircuit(self.f.num_qubits, self.n)
         qc.h(range(self.n))
-        qc.append(self.f, range(self.n + self.m))
+        qc.append(self.f, range(self.f.num_qubits))
         qc.h(range(self.n))
         qc.measure(range(self.n), range(self.n))
 
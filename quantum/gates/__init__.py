@@ -1,3 +1,12 @@
+from quantum.gates.gate_cache import GateCache, GATE_CACHE
+from quantum.gates.lazy_gate import LazyGate
+from quantum.gates.native_gate import NativeGate
+from quantum.gates.qft import (
+    qft_gate,
+    append_qft,
+    default_approximation_degree,
+    cancel_qft_pairs,
+)
 from quantum.gates.basis_permutation_gate import BasisPermutationGate
 from quantum.gates.auto_oracle_gate import AutoOracleGate
 from quantum.gates.addition_gate import AdditionGate
@@ -8,3 +17,9 @@ from quantum.gates.c_modular_multiplication_gate import (
 from quantum.gates.c_modular_inplace_multiplication_gate import (
     CModularInplaceMultiplicationGate,
 )
+from quantum.gates.table_lookup_gate import TableLookupGate
+from quantum.gates.lookup_modular_addition_gate import LookupModularAdditionGate
+from quantum.gates.windowed_modular_multiplication_gate import (
+    WindowedModularMultiplicationGate,
+)
+from quantum.gates.approximation import approximation_report
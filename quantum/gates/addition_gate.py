@@ -2,56 +2,176 @@ import qiskit as qk
 import numpy as np
 
 from quantum.utils import get_bitmask
+from quantum.gates import GATE_CACHE, LazyGate, NativeGate, append_qft
+from quantum.gates.qft import max_rotation_exponent, qft_resource_estimate
+from quantum.resources import ResourceEstimate
 
+from functools import lru_cache
 
-class AdditionGate:
+
+class AdditionGate(NativeGate):
     """Implements the PhiADD(a) gate from 'Circuit for Shor's algorithm using 2n+3 qubits'
     by Stephane Beauregard. See https://arxiv.org/abs/quant-ph/0205095
 
     Given a classical n-bit value a and a (n+1)-qubit state |b>_n ⊗ |0>_1, computes |(a+b)>_{n+1}.
+
+    With `num_controls > 0` the addition is controlled on that many additional qubits,
+    which come first. Since the adder is a product of phase rotations, this only turns
+    the rotations into (multi-)controlled phases. With `inverse`, a is subtracted.
+
+    A positive `approximation_degree` drops all rotations by pi / 2^k with k larger
+    than width - approximation_degree, in the adder as well as in the QFTs.
+
+    `a` may also be a qiskit `Parameter` to be bound later. The phase added to the
+    t-th qubit is (a mod 2^(t+1)) pi / 2^t, which equals a pi / 2^t modulo 2 pi, so
+    the phases are linear in `a`. This requires the exact adder.
     """
 
-    def __init__(self, a, width, apply_QFT) -> None:
+    def __init__(
+        self,
+        a,
+        width,
+        apply_QFT,
+        num_controls=0,
+        inverse=False,
+        approximation_degree=0,
+    ) -> None:
+        super().__init__()
         self.a = a
         self.width = width
         self.apply_QFT = apply_QFT
+        self.num_controls = num_controls
+        self.inverse = inverse
+        self.approximation_degree = approximation_degree
+        if self.is_parameterized() and approximation_degree > 0:
+            raise ValueError("A parameterized adder can not be approximated")
         self.num_qubits = None
         self._gate = None
 
     def get_native(self) -> qk.circuit.Gate:
         if not self._gate:
-            working_reg = qk.circuit.QuantumRegister(self.width + 1, "working")
-            qc = qk.QuantumCircuit(working_reg)
+            self._gate = GATE_CACHE.get(self._cache_key(), self._build_native)
+            self.num_qubits = self._gate.num_qubits
+
+        return self._gate
+
+    def is_parameterized(self) -> bool:
+        return isinstance(self.a, qk.circuit.ParameterExpression)
+
+    def get_inverse(self) -> qk.circuit.Gate:
+        return self.get_controlled(0, inverse=True)
+
+    def get_controlled(
+        self, num_ctrl_qubits: int, inverse: bool = False
+    ) -> qk.circuit.Gate:
+        controlled = AdditionGate(
+            self.a,
+            self.width,
+            self.apply_QFT,
+            num_controls=self.num_controls + num_ctrl_qubits,
+            inverse=self.inverse != inverse,
+            approximation_degree=self.approximation_degree,
+        )
+        return controlled.get_native()
+
+    def _cache_key(self) -> tuple:
+        return (
+            type(self).__name__,
+            self.a,
+            self.width,
+            self.apply_QFT,
+            self.num_controls,
+            self.inverse,
+            self.approximation_degree,
+        )
 
+    def resource_estimate(self) -> ResourceEstimate:
+        """Upper bound on the resources of the native gate, independent of the
+        classical values, without building it"""
+        return _resource_estimate(
+            self.width, self.num_controls, self.apply_QFT, self.approximation_degree
+        )
+
+    def _build_native(self) -> qk.circuit.Gate:
+        name = f"{'c' * self.num_controls}PhiADD({self.a})"
+        if self.inverse:
+            name += "_dg"
+        return LazyGate(
+            name,
+            self.num_controls + self.width + 1,
+            self._build_definition,
+            wrapper=self,
+            params=[self.a] if self.is_parameterized() else [],
+        )
+
+    def _build_definition(self) -> qk.QuantumCircuit:
+        control_reg = qk.circuit.QuantumRegister(self.num_controls, "control")
+        working_reg = qk.circuit.QuantumRegister(self.width + 1, "working")
+        qc = qk.QuantumCircuit(control_reg, working_reg)
+        self._emit(qc, qc.qubits, flat=False)
+        return qc
+
+    def _emit(self, qc: qk.QuantumCircuit, qubits: list, flat: bool) -> None:
+        control_reg = qubits[: self.num_controls]
+        working_reg = qubits[self.num_controls :]
+        max_exponent = max_rotation_exponent(
+            len(working_reg), self.approximation_degree
+        )
+
+        if self.apply_QFT:
+            # Put `b` into Fourier basis
+            append_qft(qc, working_reg, self.approximation_degree, flat=flat)
+
+        if self.is_parameterized():
+            phase_shifts = [
+                self.a * np.pi / 2**target_bit for target_bit in range(self.width + 1)
+            ]
+        else:
             # Get bits of `a` for classical control
             a_bit_mask = get_bitmask(self.a, self.width, big_endian=True)
 
-            if self.apply_QFT:
-                # Put `b` into Fourier basis
-                qc.append(
-                    qk.circuit.library.QFTGate(working_reg.size),
-                    working_reg,
-                )
-
+            phase_shifts = []
             for target_bit in range(self.width + 1):
                 phase_shift = 0
-                for control_bit in range(min(self.width, target_bit + 1)):
+                for control_bit in range(
+                    max(0, target_bit - max_exponent), min(self.width, target_bit + 1)
+                ):
                     if a_bit_mask[control_bit]:
                         phase_shift += np.pi / np.pow(2, target_bit - control_bit)
+                phase_shifts.append(phase_shift)
 
-                if phase_shift > 0:
-                    # QFT reverses the order of bits. We accout for that here
-                    qc.p(phase_shift, working_reg[self.width - target_bit])
+        for target_bit, phase_shift in enumerate(phase_shifts):
+            if self.is_parameterized() or phase_shift > 0:
+                if self.inverse:
+                    phase_shift = -phase_shift
 
-            if self.apply_QFT:
-                # Put `b` into compute basis
-                qc.append(
-                    qk.circuit.library.QFTGate(working_reg.size).inverse(),
-                    working_reg,
-                )
+                # QFT reverses the order of bits. We accout for that here
+                target = working_reg[self.width - target_bit]
+                if self.num_controls == 0:
+                    qc.p(phase_shift, target)
+                elif self.num_controls == 1:
+                    qc.cp(phase_shift, control_reg[0], target)
+                else:
+                    qc.mcp(phase_shift, control_reg, target)
 
-            self._gate = qc.to_gate()
-            self._gate.name = f"PhiADD({self.a})"
-            self.num_qubits = self._gate.num_qubits
+        if self.apply_QFT:
+            # Put `b` into compute basis
+            append_qft(
+                qc, working_reg, self.approximation_degree, inverse=True, flat=flat
+            )
 
-        return self._gate
+
+@lru_cache
+def _resource_estimate(width, num_controls, apply_QFT, approximation_degree):
+    # Assumes that every target qubit receives a phase. Controlled phases share
+    # their controls and are applied one after another.
+    phases = ResourceEstimate(
+        num_controls + width + 1,
+        {"c" * num_controls + "p": width + 1},
+        depth=1 if num_controls == 0 else width + 1,
+    )
+    if not apply_QFT:
+        return phases
+
+    qft = qft_resource_estimate(width + 1, approximation_degree)
+    return qft + phases + qft
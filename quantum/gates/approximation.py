@@ -0,0 +1,63 @@
+import qiskit as qk
+import numpy as np
+
+from qiskit.quantum_info import Statevector
+
+from quantum.gates import CModularMultiplicationGate
+
+
+def approximation_report(
+    a: int,
+    N: int,
+    width: int,
+    approximation_degrees: list[int] | None = None,
+    num_samples: int = 8,
+    seed: int | None = None,
+) -> list[dict]:
+    """Compares ´CModularMultiplicationGate(a, N, width)´ for several approximation
+    degrees of its QFTs and adders. For every degree, the gate is transpiled to
+    {u, cx} to measure its size, and its fidelity is the mean overlap with the exact
+    gate on ´num_samples´ random basis states |1>|x>|b>|0> with x, b < N."""
+    if approximation_degrees is None:
+        approximation_degrees = list(range(width + 1))
+
+    rng = np.random.default_rng(seed)
+    # The control qubit comes first, followed by x and b
+    inputs = [
+        1 | x << 1 | b << (width + 1)
+        for x, b in rng.integers(0, N, size=(num_samples, 2)).tolist()
+    ]
+
+    exact = CModularMultiplicationGate(a, N, width).get_native()
+    expected = [
+        Statevector.from_int(state, 2**exact.num_qubits).evolve(exact)
+        for state in inputs
+    ]
+
+    report = []
+    for degree in approximation_degrees:
+        gate = CModularMultiplicationGate(a, N, width, degree).get_native()
+        qc = qk.QuantumCircuit(gate.num_qubits)
+        qc.append(gate, range(gate.num_qubits))
+        qct = qk.transpile(qc, basis_gates=["u", "cx"], optimization_level=1)
+
+        fidelities = [
+            np.abs(
+                Statevector.from_int(state, 2**gate.num_qubits)
+                .evolve(gate)
+                .inner(exact_state)
+            )
+            ** 2
+            for state, exact_state in zip(inputs, expected)
+        ]
+        report.append(
+            {
+                "approximation_degree": degree,
+                "size": qct.size(),
+                "cx": qct.count_ops().get("cx", 0),
+                "depth": qct.depth(),
+                "fidelity": float(np.mean(fidelities)),
+            }
+        )
+
+    return report
@@ -1,27 +1,133 @@
 import qiskit as qk
+import numpy as np
 
-from quantum.gates import BasisPermutationGate
-from quantum.utils import reduce_basis_state, combine_basis_state
+from quantum.gates import LazyGate, NativeGate, BasisPermutationGate
+from quantum.utils import append_mcx, tabulate
+
+from enum import Enum
 
 from collections.abc import Callable
 
 
-class AutoOracleGate:
-    def __init__(self, f: Callable[[int], int], n: int, m: int) -> None:
-        """Implements an oracle for a function f:{0,1}^n \mapsto {0,1}^m"""
+class AutoOracleGate(NativeGate):
+    class Synthesis(Enum):
+        Permutation = 1
+        ReedMuller = 2
+
+    def __init__(
+        self,
+        f: Callable[[int], int],
+        n: int,
+        m: int,
+        num_ancillas: int = 0,
+        dirty_ancillas: bool = False,
+        synthesis: Synthesis = Synthesis.Permutation,
+        vectorized: bool = False,
+        num_workers: int | None = None,
+    ) -> None:
+        """Implements an oracle for a function f:{0,1}^n \\mapsto {0,1}^m
+
+        The optional ancilla qubits are appended after the n+m working qubits and
+        are used to decompose multi-controlled X gates, see ´BasisPermutationGate´.
 
-        def f_extended_to_permutation(x):
-            q_0, q_1 = reduce_basis_state(x, n)
-            return combine_basis_state(q_0, q_1 ^ f(q_0), n)
+        ´Synthesis.Permutation´ builds the oracle as a permutation of all 2^(n+m)
+        basis states. ´Synthesis.ReedMuller´ only evaluates f on the 2^n inputs and
+        XORs every output bit onto its qubit using the positive polarity Reed-Muller
+        expansion of the output bit, i.e. one multi-controlled X per monomial.
 
+        Either way, f is evaluated exactly once per input and the values are kept
+        in a compact truth table. A ´vectorized´ f is called once with the array of
+        all inputs, otherwise the calls can be spread over ´num_workers´ processes.
+        """
+        super().__init__()
+        self.f = f
         self.n = n
         self.m = m
+        self.num_ancillas = num_ancillas
+        self.dirty_ancillas = dirty_ancillas
+        self.synthesis = synthesis
+        self.vectorized = vectorized
+        self.num_workers = num_workers
+        self._truth_table = None
         self._gate = None
 
-        self._permutation_gate = BasisPermutationGate(f_extended_to_permutation, n + m)
+        self._permutation_gate = BasisPermutationGate(
+            self._extended_permutation,
+            n + m,
+            vectorized=True,
+            num_ancillas=num_ancillas,
+            dirty_ancillas=dirty_ancillas,
+        )
 
     def get_native(self) -> qk.circuit.Gate:
         if not self._gate:
-            self._gate = self._permutation_gate.get_native()
+            if self.synthesis is AutoOracleGate.Synthesis.ReedMuller:
+                self._gate = LazyGate(
+                    "oracle",
+                    self.n + self.m + self.num_ancillas,
+                    self._build_reed_muller_definition,
+                    wrapper=self,
+                )
+            else:
+                self._gate = self._permutation_gate.get_native()
 
         return self._gate
+
+    def get_truth_table(self) -> np.ndarray:
+        """Returns the array of all function values ´f(x)´ for ´x < 2 ** n´, stored
+        in the smallest unsigned integer type holding m bits"""
+        if self._truth_table is None:
+            values = tabulate(self.f, self.n, self.vectorized, self.num_workers)
+            if values.min() < 0 or values.max() >= 2**self.m:
+                raise ValueError(f"f has to map into {{0,1}}^{self.m}")
+            self._truth_table = values.astype(np.min_scalar_type(2**self.m - 1))
+        return self._truth_table
+
+    def _extended_permutation(self, x: np.ndarray) -> np.ndarray:
+        """Vectorized |q_1> ⊗ |q_0> -> |q_1 xor f(q_0)> ⊗ |q_0>"""
+        q_0 = x & (2**self.n - 1)
+        return x ^ (self.get_truth_table()[q_0].astype(np.int64) << self.n)
+
+    def get_reed_muller_monomials(self) -> list[np.ndarray]:
+        """For every output bit, returns the monomials of its Reed-Muller expansion.
+        A monomial is encoded as the bitmask of the input bits in its product."""
+        truth_table = self.get_truth_table()
+        return [
+            np.flatnonzero(
+                AutoOracleGate._reed_muller_coefficients(
+                    ((truth_table >> bit) & 1).astype(np.uint8), self.n
+                )
+            )
+            for bit in range(self.m)
+        ]
+
+    def _build_reed_muller_definition(self) -> qk.QuantumCircuit:
+        input_reg = qk.circuit.QuantumRegister(self.n, "input")
+        output_reg = qk.circuit.QuantumRegister(self.m, "output")
+        qc = qk.QuantumCircuit(input_reg, output_reg)
+        ancillas = []
+        if self.num_ancillas > 0:
+            ancilla_reg = qk.circuit.AncillaRegister(self.num_ancillas, "ancilla")
+            qc.add_register(ancilla_reg)
+            ancillas = list(range(self.n + self.m, qc.num_qubits))
+
+        for bit, monomials in enumerate(self.get_reed_muller_monomials()):
+            for monomial in monomials.tolist():
+                controls = [i for i in range(self.n) if monomial >> i & 1]
+                if controls:
+                    append_mcx(
+                        qc, controls, self.n + bit, ancillas, self.dirty_ancillas
+                    )
+                else:
+                    qc.x(self.n + bit)
+
+        return qc
+
+    def _reed_muller_coefficients(column: np.ndarray, n: int) -> np.ndarray:
+        """Computes the algebraic normal form of a boolean function given by its
+        truth table, using the in-place butterfly of the binary Moebius transform"""
+        coefficients = column.copy()
+        for i in range(n):
+            butterfly = coefficients.reshape(-1, 2, 2**i)
+            butterfly[:, 1, :] ^= butterfly[:, 0, :]
+        return coefficients
@@ -2,19 +2,85 @@ import numpy as np
 
 import qiskit as qk
 
-from quantum.utils import get_bitmask
+from quantum.utils import get_bitmask, append_mcx, tabulate
+from quantum.gates import LazyGate, NativeGate
+
+from enum import Enum
 
 from collections.abc import Callable
 from typing import Tuple, List
 
 
-class BasisPermutationGate:
-    def __init__(self, f: Callable[[int], int], num_qubits: int) -> None:
-        """Implements a permutation given by an injective function f:{0,1}^n mapsto {0,1}^n"""
+class BasisPermutationGate(NativeGate):
+    class Synthesis(Enum):
+        Transpositions = 1
+        GrayCode = 2
+
+    def __init__(
+        self,
+        f: Callable[[int], int] | np.ndarray,
+        num_qubits: int,
+        vectorized: bool = False,
+        synthesis: Synthesis = Synthesis.Transpositions,
+        num_ancillas: int = 0,
+        dirty_ancillas: bool = False,
+        cancel_flips: bool = True,
+    ) -> None:
+        """Implements a permutation given by an injective function f:{0,1}^n mapsto {0,1}^n
+
+        ´f´ is either a callable on basis states or a precomputed array with
+        ´f[x]´ being the image of ´x´. If ´vectorized´ is set, the callable is
+        evaluated once on the array of all basis states instead of once per state.
+
+        ´synthesis´ selects how the cycles are turned into multi-controlled X gates.
+        ´Synthesis.GrayCode´ chains the transpositions of every cycle such that
+        neighbouring swaps share their single-bit flips, which then cancel.
+
+        If ´num_ancillas´ is positive, the gate acts on that many additional ancilla
+        qubits, which are used to decompose the multi-controlled X gates at linear
+        instead of quadratic cost. The ancillas are returned in their initial state.
+        Unless ´dirty_ancillas´ is set, they are expected to start in |0>.
+
+        With ´cancel_flips´, the X gates selecting the control pattern of each
+        multi-controlled X are merged across consecutive gates and only the net
+        flips are emitted. Disable it to get one flip/unflip pair per gate.
+        """
+        super().__init__()
         self.f = f
         self.num_qubits = num_qubits
+        self.vectorized = vectorized
+        self.synthesis = synthesis
+        self.num_ancillas = num_ancillas
+        self.dirty_ancillas = dirty_ancillas
+        self.cancel_flips = cancel_flips
+        self._permutation = None
+        self._flip_operations = None
         self._gate = None
 
+    def get_permutation(self) -> np.ndarray:
+        """Returns the permutation as an array of length ´2 ** num_qubits´ with
+        ´permutation[x] = f(x)´"""
+        if self._permutation is None:
+            size = 2**self.num_qubits
+            if isinstance(self.f, np.ndarray):
+                permutation = np.asarray(self.f, dtype=np.int64)
+            else:
+                permutation = tabulate(self.f, self.num_qubits, self.vectorized)
+
+            if permutation.shape != (size,):
+                raise ValueError(
+                    f"Permutation must have shape ({size},), got {permutation.shape}"
+                )
+            if (
+                permutation.min() < 0
+                or permutation.max() >= size
+                or not np.all(np.bincount(permutation, minlength=size) == 1)
+            ):
+                raise ValueError("f does not define a permutation of the basis states")
+
+            self._permutation = permutation
+        return self._permutation
+
     def get_native(self) -> qk.circuit.Gate:
         """Builds a gate which is equivalent to the permutation matrix obtained by
 
@@ -25,52 +91,77 @@ class BasisPermutationGate:
         ´´´
         """
         if not self._gate:
-            qc = qk.QuantumCircuit(self.num_qubits)
+            self._gate = LazyGate(
+                "basis_permutation",
+                self.num_qubits + self.num_ancillas,
+                self._build_definition,
+                wrapper=self,
+            )
+        return self._gate
+
+    def _build_definition(self) -> qk.QuantumCircuit:
+        working_reg = qk.circuit.QuantumRegister(self.num_qubits, "working")
+        qc = qk.QuantumCircuit(working_reg)
+        if self.num_ancillas > 0:
+            qc.add_register(qk.circuit.AncillaRegister(self.num_ancillas, "ancilla"))
+
+        if self.cancel_flips:
+            self._add_flip_operations_circuit(qc, self.get_flip_operations())
+        else:
+            for a, bit in self.get_flip_operations():
+                self._add_flip_single_bit_circuit(qc, a, bit)
+        return qc
 
+    def get_flip_operations(self) -> List[Tuple[int, int]]:
+        """Returns the synthesized circuit as a list of ´(a, bit)´, each standing for
+        the multi-controlled X that swaps the basis states ´a´ and ´a ^ 2**bit´"""
+        if self._flip_operations is None:
             cycles = BasisPermutationGate._permutation_get_cycles(
-                self.f, self.num_qubits
+                self.get_permutation()
             )
-            for cycle in cycles:
-                transpositions = (
-                    BasisPermutationGate._permutation_cycle_get_transpositions(
-                        cycle.astype(np.int64)
+
+            operations = []
+            if self.synthesis is BasisPermutationGate.Synthesis.GrayCode:
+                for cycle in cycles:
+                    operations += self._gray_code_cycle_operations(cycle)
+                operations = BasisPermutationGate._cancel_flip_operations(operations)
+            else:
+                for cycle in cycles:
+                    transpositions = (
+                        BasisPermutationGate._permutation_cycle_get_transpositions(
+                            cycle
+                        )
                     )
-                )
-                for transposition in transpositions:
-                    self._add_swap_basis_states_circuit(
-                        qc, transposition[0], transposition[1]
-                    )  # ,
-                    # range(self.num_qubits),
-                    # )
-            self._gate = qc.to_gate()
-        return self._gate
+                    for transposition in transpositions:
+                        operations += self._swap_basis_states_operations(
+                            int(transposition[0]), int(transposition[1])
+                        )
+
+            self._flip_operations = operations
+        return self._flip_operations
+
+    def count_mcx(self) -> int:
+        """Number of multi-controlled X gates in the synthesized circuit"""
+        return len(self.get_flip_operations())
 
-    def _permutation_get_cycles(f: Callable[[int], int], num_qubits: int):
-        indices = np.arange(2**num_qubits)
-        current_cycle = np.full(2**num_qubits, fill_value=-1, dtype=int)
-        current_index = 0
-        v = int(indices[0])
-
-        while True:
-            current_cycle[current_index] = v
-            current_index += 1
-            indices[v] = 0
-            v = f(v)
-            if v == current_cycle[0]:
-                invalid = np.where(current_cycle == -1)[0]
-                if invalid.size > 0:
-                    yield current_cycle[: invalid[0]]
-                else:
-                    yield current_cycle
-
-                current_cycle[:] = -1
-
-                remaining_indices = np.nonzero(indices)[0]
-                if remaining_indices.size > 0:
-                    v = int(remaining_indices[0])
-                    current_index = 0
-                else:
-                    return
+    def _permutation_get_cycles(permutation: np.ndarray):
+        """Yields the non-trivial cycles of ´permutation´ in a single pass over the
+        basis states. Visited states are tracked in a bitmap, so every state is
+        touched exactly once and only the current cycle is buffered."""
+        visited = permutation == np.arange(permutation.size)
+        for start in np.flatnonzero(~visited).tolist():
+            if visited[start]:
+                continue
+
+            cycle = [start]
+            visited[start] = True
+            v = int(permutation[start])
+            while v != start:
+                cycle.append(v)
+                visited[v] = True
+                v = int(permutation[v])
+
+            yield np.array(cycle, dtype=np.int64)
 
     def _permutation_cycle_get_transpositions(
         cycle: np.ndarray,
@@ -80,7 +171,6 @@ class BasisPermutationGate:
     def _add_flip_single_bit_circuit(
         self, qc: qk.QuantumCircuit, a: int, bit: int
     ) -> None:
-        # qc = qk.QuantumCircuit(self.num_qubits)
         a_mask = get_bitmask(a, self.num_qubits)
         a_mask[bit] = 1
 
@@ -88,25 +178,116 @@ class BasisPermutationGate:
         controls_to_flip = np.where(a_mask == 0)[0]
         if controls_to_flip.size > 0:
             qc.x(controls_to_flip)
-        qc.mcx(controls.tolist(), bit)
+        self._add_mcx_circuit(qc, controls.tolist(), bit)
         if controls_to_flip.size > 0:
             qc.x(controls_to_flip)
-        # return qc
 
-    def _add_swap_basis_states_circuit(
-        self, qc: qk.QuantumCircuit, a: int, b: int
-    ) -> None:
+    def _swap_basis_states_operations(self, a: int, b: int) -> List[Tuple[int, int]]:
         if a == b:
-            return
+            return []
 
-        bits_to_flip = np.where(get_bitmask(a ^ b, self.num_qubits) == 1)[0]
+        bits_to_flip = np.where(get_bitmask(a ^ b, self.num_qubits) == 1)[0].tolist()
 
+        operations = []
         for bit in bits_to_flip[:-1]:
-            self._add_flip_single_bit_circuit(qc, a, bit)
+            operations.append((a, bit))
             a ^= 2**bit
 
-        self._add_flip_single_bit_circuit(qc, a, bits_to_flip[-1])
+        operations.append((a, bits_to_flip[-1]))
 
         for bit in bits_to_flip[-2::-1]:
-            self._add_flip_single_bit_circuit(qc, a, bit)
+            operations.append((a, bit))
             a ^= 2**bit
+        return operations
+
+    def _add_flip_operations_circuit(
+        self, qc: qk.QuantumCircuit, operations: List[Tuple[int, int]]
+    ) -> None:
+        """Emits ´operations´ while keeping track of the qubits currently flipped
+        by X gates, such that flips shared by consecutive gates are only applied
+        once. Flips of the target commute with the mcx and stay pending."""
+        all_qubits = (1 << self.num_qubits) - 1
+        flipped = 0
+        for a, bit in operations:
+            target = 1 << bit
+            controls = all_qubits & ~target
+            to_flip = (flipped ^ ~a) & controls
+            if to_flip:
+                qc.x(_bits(to_flip))
+                flipped ^= to_flip
+
+            self._add_mcx_circuit(qc, _bits(controls), bit)
+
+        if flipped:
+            qc.x(_bits(flipped))
+
+    def _add_mcx_circuit(
+        self, qc: qk.QuantumCircuit, controls: List[int], target: int
+    ) -> None:
+        ancillas = range(self.num_qubits, self.num_qubits + self.num_ancillas)
+        append_mcx(qc, controls, target, list(ancillas), self.dirty_ancillas)
+
+    def _gray_code_cycle_operations(self, cycle: np.ndarray) -> List[Tuple[int, int]]:
+        """Decomposes ´cycle´ into the transpositions ´(c_i, c_{i+1})´ and walks each
+        of them along a Gray code path. The walk from ´c_i´ starts with the bits it
+        shares with the walk of the following transposition, which is also anchored
+        at ´c_i´, so that the outermost flips of both coincide and cancel."""
+        # Leave out the most expensive edge of the cycle
+        distances = np.bitwise_count(cycle ^ np.roll(cycle, -1))
+        cycle = np.roll(cycle, -(int(np.argmax(distances)) + 1)).tolist()
+        diffs = [cycle[i] ^ cycle[i + 1] for i in range(len(cycle) - 1)]
+
+        operations = []
+        for i in range(len(diffs) - 1, -1, -1):
+            diff = diffs[i]
+            shared_next = diff & diffs[i - 1] if i > 0 else 0
+            shared_prev = diff & diffs[i + 1] if i + 1 < len(diffs) else 0
+
+            # The bit swapped in the middle of the walk should not be shared with
+            # a neighbouring transposition
+            unshared = diff & ~(shared_next | shared_prev)
+            if unshared:
+                middle = unshared & -unshared
+            elif diff & ~shared_next:
+                middle = 1 << ((diff & ~shared_next).bit_length() - 1)
+            else:
+                middle = 1 << (diff.bit_length() - 1)
+
+            bits_a = _bits(shared_next & ~middle) + _bits(unshared & ~middle)
+            bits_b = _bits(shared_prev & ~shared_next & ~middle)
+
+            walk_a = _gray_code_walk(cycle[i], bits_a)
+            walk_b = _gray_code_walk(cycle[i + 1], bits_b)
+            state = cycle[i]
+            for bit in bits_a:
+                state ^= 1 << bit
+
+            operations += walk_b + walk_a
+            operations.append((state, middle.bit_length() - 1))
+            operations += walk_b[::-1] + walk_a[::-1]
+        return operations
+
+    def _cancel_flip_operations(
+        operations: List[Tuple[int, int]],
+    ) -> List[Tuple[int, int]]:
+        """Removes adjacent pairs of identical multi-controlled X gates"""
+        result = []
+        for state, bit in operations:
+            operation = (state | (1 << bit), bit)
+            if result and result[-1] == operation:
+                result.pop()
+            else:
+                result.append(operation)
+        return result
+
+
+def _bits(mask: int) -> List[int]:
+    return [bit for bit in range(mask.bit_length()) if mask >> bit & 1]
+
+
+def _gray_code_walk(state: int, bits: List[int]) -> List[Tuple[int, int]]:
+    walk = []
+    for bit in bits:
+        walk.append((state, bit))
+        state ^= 1 << bit
+    return walk
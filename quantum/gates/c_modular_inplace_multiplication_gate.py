@@ -2,10 +2,14 @@ import qiskit as qk
 
 import math
 
-from quantum.gates import CModularMultiplicationGate
+from quantum.gates import GATE_CACHE, LazyGate, NativeGate, CModularMultiplicationGate
+from quantum.resources import ResourceEstimate
 
+from functools import lru_cache
+from numbers import Integral
 
-class CModularInplaceMultiplicationGate:
+
+class CModularInplaceMultiplicationGate(NativeGate):
     """Implements the U_a gate from 'Circuit for Shor's algorithm using 2n+3 qubits'
     by Stephane Beauregard. See https://arxiv.org/abs/quant-ph/0205095
 
@@ -14,37 +18,112 @@ class CModularInplaceMultiplicationGate:
     and that `gcd(a,N)=1`.
 
     The circuit is controlled on the first qubit.
+
+    Instead of an integer, `a` may be a sequence of 2n qiskit `Parameter`s. The first
+    n are the parameters of CMULT(a), the last n those of CMULT(a^-1), see
+    `CModularMultiplicationGate`. Their values are returned by `parameter_values`.
     """
 
-    def __init__(self, a, N, width) -> None:
-        assert a < N, "a must be strictly smaller than N"
-        assert math.gcd(a, N) == 1, "gcd(a,N) must be equal to 1."
+    def __init__(self, a, N, width, approximation_degree=0) -> None:
+        if isinstance(a, Integral):
+            assert a < N, "a must be strictly smaller than N"
+            assert math.gcd(a, N) == 1, "gcd(a,N) must be equal to 1."
+        else:
+            a = tuple(a)
+            assert len(a) == 2 * width, "a must consist of two parameters per bit"
 
+        super().__init__()
         self.a = a
         self.N = N
         self.width = width
+        self.approximation_degree = approximation_degree
         self.num_qubits = None
         self._gate = None
 
     def get_native(self) -> qk.circuit.Gate:
         if not self._gate:
-            control_reg = qk.circuit.QuantumRegister(1, "control")
-            working_reg = qk.circuit.QuantumRegister(self.width, "working")
-            ancilla_reg = qk.circuit.AncillaRegister(self.width + 2, "ancilla")
-            qc = qk.QuantumCircuit(control_reg, working_reg, ancilla_reg)
+            self._gate = GATE_CACHE.get(self._cache_key(), self._build_native)
+            self.num_qubits = self._gate.num_qubits
+
+        return self._gate
 
-            mult_a = CModularMultiplicationGate(self.a, self.N, self.width)
-            qc.append(mult_a.get_native(), range(qc.num_qubits))
+    def is_parameterized(self) -> bool:
+        return isinstance(self.a, tuple)
 
-            for bit in range(working_reg.size):
-                qc.cswap(control_reg[0], working_reg[bit], ancilla_reg[bit])
+    def parameter_values(a: int, N: int, width: int) -> list[int]:
+        """Values of the parameters standing for the integer ´a´"""
+        return CModularMultiplicationGate.parameter_values(
+            a, N, width
+        ) + CModularMultiplicationGate.parameter_values(pow(a, -1, N), N, width)
 
-            a_inv = pow(self.a, -1, self.N)
-            mult_a_inv = CModularMultiplicationGate(a_inv, self.N, self.width)
-            qc.append(mult_a_inv.get_native().inverse(), range(qc.num_qubits))
+    def _cache_key(self) -> tuple:
+        return (
+            type(self).__name__,
+            self.a,
+            self.N,
+            self.width,
+            self.approximation_degree,
+        )
 
-            self._gate = qc.to_gate()
-            self._gate.name = f"U_a({self.a})MOD({self.N})"
-            self.num_qubits = self._gate.num_qubits
+    def resource_estimate(self) -> ResourceEstimate:
+        """Upper bound on the resources of the native gate, independent of the
+        classical values, without building it"""
+        return _resource_estimate(self.width, self.approximation_degree)
 
-        return self._gate
+    def _build_native(self) -> qk.circuit.Gate:
+        if self.is_parameterized():
+            name = f"U_a({self.a[0]}..{self.a[-1]})MOD({self.N})"
+        else:
+            name = f"U_a({self.a})MOD({self.N})"
+        return LazyGate(
+            name,
+            2 * self.width + 3,
+            self._build_definition,
+            wrapper=self,
+            params=list(self.a) if self.is_parameterized() else [],
+        )
+
+    def _build_definition(self) -> qk.QuantumCircuit:
+        control_reg = qk.circuit.QuantumRegister(1, "control")
+        working_reg = qk.circuit.QuantumRegister(self.width, "working")
+        ancilla_reg = qk.circuit.AncillaRegister(self.width + 2, "ancilla")
+        qc = qk.QuantumCircuit(control_reg, working_reg, ancilla_reg)
+        self._emit(qc, qc.qubits, flat=False)
+        return qc
+
+    def _emit(self, qc: qk.QuantumCircuit, qubits: list, flat: bool) -> None:
+        control_reg = qubits[:1]
+        working_reg = qubits[1 : self.width + 1]
+        ancilla_reg = qubits[self.width + 1 :]
+
+        if self.is_parameterized():
+            a, a_inv = self.a[: self.width], self.a[self.width :]
+        else:
+            a, a_inv = self.a, pow(self.a, -1, self.N)
+
+        mult_a = CModularMultiplicationGate(
+            a, self.N, self.width, self.approximation_degree
+        )
+        if flat:
+            mult_a.emit_into(qc, qubits)
+        else:
+            qc.append(mult_a.get_native(), qubits)
+
+        for bit in range(len(working_reg)):
+            qc.cswap(control_reg[0], working_reg[bit], ancilla_reg[bit])
+
+        mult_a_inv = CModularMultiplicationGate(
+            a_inv, self.N, self.width, self.approximation_degree
+        )
+        if flat:
+            mult_a_inv.emit_into(qc, qubits, inverse=True)
+        else:
+            qc.append(mult_a_inv.get_inverse(), qubits)
+
+
+@lru_cache
+def _resource_estimate(width, approximation_degree):
+    mult = CModularMultiplicationGate(0, 0, width, approximation_degree)
+    # The swaps share their control and are applied one after another
+    swaps = ResourceEstimate(2 * width + 3, {"cswap": width}, depth=width)
+    return mult.resource_estimate() * 2 + swaps
@@ -1,10 +1,21 @@
 import qiskit as qk
 import numpy as np
 
-from quantum.gates import CCModularAdditionGate
+from quantum.gates import (
+    GATE_CACHE,
+    LazyGate,
+    NativeGate,
+    CCModularAdditionGate,
+    append_qft,
+)
+from quantum.gates.qft import qft_resource_estimate
+from quantum.resources import ResourceEstimate
 
+from functools import lru_cache
+from numbers import Integral
 
-class CModularMultiplicationGate:
+
+class CModularMultiplicationGate(NativeGate):
     """Implements the CMULT(a)MOD(N) gate from 'Circuit for Shor's algorithm using 2n+3 qubits'
     by Stephane Beauregard. See https://arxiv.org/abs/quant-ph/0205095
 
@@ -12,47 +23,113 @@ class CModularMultiplicationGate:
     computes |x>_n ⊗ |b+(ax) mod N>_n ⊗ |0>_1. It is assumed that a,b < N.
 
     The circuit is controlled on the first qubit.
+
+    Instead of an integer, `a` may be a sequence of n qiskit `Parameter`s, the j-th
+    standing for the addend (a * 2^j) mod N of the j-th modular adder. Their values
+    for a given integer are returned by `parameter_values`.
     """
 
-    def __init__(self, a, N, width) -> None:
+    def __init__(self, a, N, width, approximation_degree=0) -> None:
+        if not isinstance(a, Integral):
+            a = tuple(a)
+            assert len(a) == width, "a must consist of one parameter per bit"
+        super().__init__()
         self.a = a
         self.N = N
         self.width = width
+        self.approximation_degree = approximation_degree
         self.num_qubits = None
         self._gate = None
 
     def get_native(self) -> qk.circuit.Gate:
         if not self._gate:
-            control_reg = qk.circuit.QuantumRegister(1, "control")
-            x_reg = qk.circuit.QuantumRegister(self.width, "x")
-            b_reg = qk.circuit.QuantumRegister(self.width + 1, "b")
-            ancilla_reg = qk.circuit.AncillaRegister(1, "ancilla")
-            qc = qk.QuantumCircuit(control_reg, x_reg, b_reg, ancilla_reg)
-
-            # Put `b` into Fourier basis
-            qft = qk.circuit.library.QFTGate(b_reg.size)
-            qc.append(qft, b_reg)
-
-            factor = self.a
-            for bit in range(self.width):
-                mod_add = CCModularAdditionGate(
-                    factor % self.N,
-                    self.N,
-                    self.width,
-                    apply_QFT=False,
-                )
-                qc.append(
-                    mod_add.get_native(),
-                    [control_reg[0], x_reg[bit]] + b_reg[:] + ancilla_reg[:],
-                )
-
-                factor *= 2
-
-            # Put `b` into compute basis
-            qc.append(qft.inverse(), b_reg)
-
-            self._gate = qc.to_gate()
-            self._gate.name = f"CMULT({self.a})MOD({self.N})"
+            self._gate = GATE_CACHE.get(self._cache_key(), self._build_native)
             self.num_qubits = self._gate.num_qubits
 
         return self._gate
+
+    def is_parameterized(self) -> bool:
+        return isinstance(self.a, tuple)
+
+    def parameter_values(a: int, N: int, width: int) -> list[int]:
+        """Values of the parameters standing for the integer ´a´"""
+        return [(a << bit) % N for bit in range(width)]
+
+    def _cache_key(self) -> tuple:
+        return (
+            type(self).__name__,
+            self.a,
+            self.N,
+            self.width,
+            self.approximation_degree,
+        )
+
+    def resource_estimate(self) -> ResourceEstimate:
+        """Upper bound on the resources of the native gate, independent of the
+        classical values, without building it"""
+        return _resource_estimate(self.width, self.approximation_degree)
+
+    def _build_native(self) -> qk.circuit.Gate:
+        if self.is_parameterized():
+            name = f"CMULT({self.a[0]}..{self.a[-1]})MOD({self.N})"
+        else:
+            name = f"CMULT({self.a})MOD({self.N})"
+        return LazyGate(
+            name,
+            2 * self.width + 3,
+            self._build_definition,
+            wrapper=self,
+            params=list(self.a) if self.is_parameterized() else [],
+        )
+
+    def _build_definition(self) -> qk.QuantumCircuit:
+        control_reg = qk.circuit.QuantumRegister(1, "control")
+        x_reg = qk.circuit.QuantumRegister(self.width, "x")
+        b_reg = qk.circuit.QuantumRegister(self.width + 1, "b")
+        ancilla_reg = qk.circuit.AncillaRegister(1, "ancilla")
+        qc = qk.QuantumCircuit(control_reg, x_reg, b_reg, ancilla_reg)
+        self._emit(qc, qc.qubits, flat=False)
+        return qc
+
+    def _emit(self, qc: qk.QuantumCircuit, qubits: list, flat: bool) -> None:
+        control_reg = qubits[:1]
+        x_reg = qubits[1 : self.width + 1]
+        b_reg = qubits[self.width + 1 : 2 * self.width + 2]
+        ancilla_reg = qubits[2 * self.width + 2 :]
+
+        # Put `b` into Fourier basis
+        append_qft(qc, b_reg, self.approximation_degree, flat=flat)
+
+        if self.is_parameterized():
+            addends = self.a
+        else:
+            addends = CModularMultiplicationGate.parameter_values(
+                self.a, self.N, self.width
+            )
+
+        for bit, addend in enumerate(addends):
+            mod_add = CCModularAdditionGate(
+                addend,
+                self.N,
+                self.width,
+                apply_QFT=False,
+                approximation_degree=self.approximation_degree,
+            )
+            mod_add_qubits = [control_reg[0], x_reg[bit]] + b_reg + ancilla_reg
+            if flat:
+                mod_add.emit_into(qc, mod_add_qubits)
+            else:
+                qc.append(mod_add.get_native(), mod_add_qubits)
+
+        # Put `b` into compute basis
+        append_qft(qc, b_reg, self.approximation_degree, inverse=True, flat=flat)
+
+
+@lru_cache
+def _resource_estimate(width, approximation_degree):
+    mod_add = CCModularAdditionGate(
+        0, 0, width, apply_QFT=False, approximation_degree=approximation_degree
+    )
+    qubits = ResourceEstimate(2 * width + 3)
+    qft = qft_resource_estimate(width + 1, approximation_degree)
+    return qubits + qft + mod_add.resource_estimate() * width + qft
@@ -2,81 +2,165 @@ import qiskit as qk
 import numpy as np
 
 from quantum.utils import get_bitmask
-from quantum.gates import AdditionGate
+from quantum.gates import GATE_CACHE, LazyGate, NativeGate, AdditionGate, append_qft
+from quantum.gates.qft import qft_resource_estimate
+from quantum.resources import ResourceEstimate
 
+from functools import lru_cache
 
-class CCModularAdditionGate:
+
+class CCModularAdditionGate(NativeGate):
     """Implements the PhiADD(a)MOD(N) gate from 'Circuit for Shor's algorithm using 2n+3 qubits'
     by Stephane Beauregard. See https://arxiv.org/abs/quant-ph/0205095
 
     Given classical n-bit values `a`, `N` and a `(n+1)`-qubit state `|b>_n ⊗ |0>_1`,
     computes `|(a+b)>_{n+1}`. It is assumed that a,b < N.
 
-    The circuit is controlled on the first two qubits.
+    The circuit is controlled on the first two qubits. `a` may also be a qiskit
+    `Parameter`, see `AdditionGate`.
     """
 
-    def __init__(self, a, N, width, apply_QFT) -> None:
+    def __init__(self, a, N, width, apply_QFT, approximation_degree=0) -> None:
+        super().__init__()
         self.a = a
         self.N = N
         self.width = width
         self.apply_QFT = apply_QFT
+        self.approximation_degree = approximation_degree
         self.num_qubits = None
         self._gate = None
 
     def get_native(self) -> qk.circuit.Gate:
         if not self._gate:
-            control_reg = qk.circuit.QuantumRegister(2, "control")
-            working_reg = qk.circuit.QuantumRegister(self.width + 1, "working")
-            ancilla_reg = qk.circuit.AncillaRegister(1, "ancilla")
-            qc = qk.QuantumCircuit(control_reg, working_reg, ancilla_reg)
-
-            qft = qk.circuit.library.QFTGate(working_reg.size)
-            if self.apply_QFT:
-                # Put `b` into Fourier basis
-                qc.append(qft, working_reg)
-
-            add_a_gate = AdditionGate(self.a, self.width, apply_QFT=False)
-            add_N_gate = AdditionGate(self.N, self.width, apply_QFT=False)
-
-            qc.append(
-                add_a_gate.get_native().control(control_reg.size),
-                control_reg[:] + working_reg[:],
-            )
-            qc.append(
-                add_N_gate.get_native().inverse(),
-                working_reg,
-            )
-
-            qc.append(qft.inverse(), working_reg)
-            qc.cx(working_reg[-1], ancilla_reg)
-            qc.append(qft, working_reg)
-
-            qc.append(
-                add_N_gate.get_native().control(ancilla_reg.size),
-                ancilla_reg[:] + working_reg[:],
-            )
-            qc.append(
-                add_a_gate.get_native().inverse().control(control_reg.size),
-                control_reg[:] + working_reg[:],
-            )
+            self._gate = GATE_CACHE.get(self._cache_key(), self._build_native)
+            self.num_qubits = self._gate.num_qubits
 
-            qc.append(qft.inverse(), working_reg)
-            qc.x(working_reg[-1])
-            qc.cx(working_reg[-1], ancilla_reg)
-            qc.x(working_reg[-1])
-            qc.append(qft, working_reg)
+        return self._gate
 
-            qc.append(
-                add_a_gate.get_native().control(control_reg.size),
-                control_reg[:] + working_reg[:],
+    def _cache_key(self) -> tuple:
+        return (
+            type(self).__name__,
+            self.a,
+            self.N,
+            self.width,
+            self.apply_QFT,
+            self.approximation_degree,
+        )
+
+    def resource_estimate(self) -> ResourceEstimate:
+        """Upper bound on the resources of the native gate, independent of the
+        classical values, without building it"""
+        return _resource_estimate(self.width, self.apply_QFT, self.approximation_degree)
+
+    def _build_native(self) -> qk.circuit.Gate:
+        name = f"PhiADD({self.a})MOD({self.N})"
+        return LazyGate(
+            name,
+            self.width + 4,
+            self._build_definition,
+            wrapper=self,
+            params=(
+                [self.a] if isinstance(self.a, qk.circuit.ParameterExpression) else []
+            ),
+        )
+
+    def _build_definition(self) -> qk.QuantumCircuit:
+        control_reg = qk.circuit.QuantumRegister(2, "control")
+        working_reg = qk.circuit.QuantumRegister(self.width + 1, "working")
+        ancilla_reg = qk.circuit.AncillaRegister(1, "ancilla")
+        qc = qk.QuantumCircuit(control_reg, working_reg, ancilla_reg)
+        self._emit(qc, qc.qubits, flat=False)
+        return qc
+
+    def _emit(self, qc: qk.QuantumCircuit, qubits: list, flat: bool) -> None:
+        control_reg = qubits[:2]
+        working_reg = qubits[2 : self.width + 3]
+        ancilla_reg = qubits[self.width + 3 :]
+
+        def qft(inverse=False):
+            append_qft(
+                qc, working_reg, self.approximation_degree, inverse=inverse, flat=flat
             )
 
-            if self.apply_QFT:
-                # Put `b` into compute basis
-                qc.append(qft.inverse(), working_reg)
-
-            self._gate = qc.to_gate()
-            self._gate.name = f"PhiADD({self.a})MOD({self.N})"
-            self.num_qubits = self._gate.num_qubits
-
-        return self._gate
+        def add(value, controls, inverse=False):
+            if flat:
+                adder = AdditionGate(
+                    value,
+                    self.width,
+                    apply_QFT=False,
+                    num_controls=len(controls),
+                    inverse=inverse,
+                    approximation_degree=self.approximation_degree,
+                )
+                adder.emit_into(qc, controls + working_reg)
+            else:
+                adder = AdditionGate(
+                    value,
+                    self.width,
+                    apply_QFT=False,
+                    approximation_degree=self.approximation_degree,
+                )
+                qc.append(
+                    adder.get_controlled(len(controls), inverse),
+                    controls + working_reg,
+                )
+
+        if self.apply_QFT:
+            # Put `b` into Fourier basis
+            qft()
+
+        add(self.a, control_reg)
+        add(self.N, [], inverse=True)
+
+        qft(inverse=True)
+        qc.cx(working_reg[-1], ancilla_reg)
+        qft()
+
+        add(self.N, ancilla_reg)
+        add(self.a, control_reg, inverse=True)
+
+        qft(inverse=True)
+        qc.x(working_reg[-1])
+        qc.cx(working_reg[-1], ancilla_reg)
+        qc.x(working_reg[-1])
+        qft()
+
+        add(self.a, control_reg)
+
+        if self.apply_QFT:
+            # Put `b` into compute basis
+            qft(inverse=True)
+
+
+@lru_cache
+def _resource_estimate(width, apply_QFT, approximation_degree):
+    def add(num_controls):
+        adder = AdditionGate(
+            0,
+            width,
+            apply_QFT=False,
+            num_controls=num_controls,
+            approximation_degree=approximation_degree,
+        )
+        return adder.resource_estimate()
+
+    qft = qft_resource_estimate(width + 1, approximation_degree)
+    copy_sign = ResourceEstimate(width + 4, {"cx": 1}, depth=1)
+    copy_inverted_sign = ResourceEstimate(width + 4, {"x": 2, "cx": 1}, depth=3)
+
+    estimate = (
+        add(2)
+        + add(0)
+        + qft
+        + copy_sign
+        + qft
+        + add(1)
+        + add(2)
+        + qft
+        + copy_inverted_sign
+        + qft
+        + add(2)
+    )
+    if apply_QFT:
+        estimate = qft + estimate + qft
+    return estimate
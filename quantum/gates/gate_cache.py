@@ -0,0 +1,62 @@
+import qiskit as qk
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from threading import Lock
+
+
+class GateCache:
+    """Bounded LRU cache for built gates, keyed by the gate class and its parameters.
+
+    The arithmetic gates share the process-wide instance ´GATE_CACHE´, so identical
+    subcircuits are built only once, across gates as well as across circuits.
+
+    The cache can be shared between threads. Gates are built outside of the lock, so
+    two threads missing the same key at once may both build it.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._gates = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, build: Callable[[], qk.circuit.Gate]):
+        """Returns the gate cached for ´key´, building it with ´build´ on a miss"""
+        with self._lock:
+            if key in self._gates:
+                self.hits += 1
+                self._gates.move_to_end(key)
+                return self._gates[key]
+            self.misses += 1
+
+        gate = build()
+        with self._lock:
+            gate = self._gates.setdefault(key, gate)
+            if len(self._gates) > self.maxsize:
+                self._gates.popitem(last=False)
+        return gate
+
+    def clear(self) -> None:
+        with self._lock:
+            self._gates.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._gates),
+            "maxsize": self.maxsize,
+        }
+
+    def __len__(self) -> int:
+        return len(self._gates)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._gates
+
+
+GATE_CACHE = GateCache()
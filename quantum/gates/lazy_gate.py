@@ -0,0 +1,88 @@
+import qiskit as qk
+
+from collections.abc import Callable
+from threading import RLock
+
+# Building a definition may build the definitions of other lazy gates, hence the
+# reentrant lock. A single module-wide lock keeps the gates copyable and picklable.
+_DEFINE_LOCK = RLock()
+
+
+class LazyGate(qk.circuit.Gate):
+    """A gate whose definition is only built when it is first accessed, e.g. when
+    the gate is decomposed or transpiled. Its name and number of qubits are known
+    up front, so circuits containing it can be built and drawn without paying the
+    construction cost of its sub-circuit.
+
+    ´wrapper´ refers to the ´NativeGate´ which created the gate, if any. If the
+    definition depends on unbound parameters, they have to be given as ´params´.
+    Parameter expressions are registered via the parameters they depend on.
+
+    The definition is built at most once, even if several threads access it at once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        num_qubits: int,
+        build: Callable[[], qk.QuantumCircuit],
+        wrapper=None,
+        params: list | None = None,
+    ) -> None:
+        parameters = []
+        for param in params or []:
+            if not isinstance(param, qk.circuit.ParameterExpression):
+                parameters.append(param)
+                continue
+            for parameter in sorted(param.parameters, key=lambda p: p.name):
+                if parameter not in parameters:
+                    parameters.append(parameter)
+        super().__init__(name, num_qubits, parameters)
+        self._build = build
+        self._unbound_params = list(self.params)
+        self.wrapper = wrapper
+
+    def is_defined(self) -> bool:
+        return self._definition is not None
+
+    def _define(self) -> None:
+        with _DEFINE_LOCK:
+            if self._definition is not None:
+                return
+
+            definition = self._build()
+            # Parameters bound before the definition was built
+            bindings = {
+                parameter: value
+                for parameter, value in zip(self._unbound_params, self.params)
+                if value is not parameter
+            }
+            if bindings:
+                definition = definition.assign_parameters(bindings)
+            self.definition = definition
+
+    def inverse(self, annotated: bool = False) -> qk.circuit.Gate:
+        if annotated:
+            return super().inverse(annotated=True)
+
+        name = self.name[:-3] if self.name.endswith("_dg") else self.name + "_dg"
+        return LazyGate(
+            name,
+            self.num_qubits,
+            lambda: self.definition.inverse(),
+            params=self.params,
+        )
+
+    def __copy__(self) -> "LazyGate":
+        # Copies share the builder and stay lazy
+        copied = type(self).__new__(type(self))
+        copied.__dict__.update(self.__dict__)
+        return copied
+
+    def __getstate__(self) -> dict:
+        # The builder is usually a closure or bound method. Pickle the built
+        # definition instead.
+        self.definition
+        state = self.__dict__.copy()
+        state["_build"] = None
+        return state
@@ -0,0 +1,163 @@
+import qiskit as qk
+
+from quantum.gates import (
+    GATE_CACHE,
+    LazyGate,
+    NativeGate,
+    AdditionGate,
+    TableLookupGate,
+    append_qft,
+)
+from quantum.gates.qft import qft_resource_estimate
+from quantum.resources import ResourceEstimate
+
+from functools import lru_cache
+
+
+class LookupModularAdditionGate(NativeGate):
+    """Windowed variant of the PhiADD(a)MOD(N) gate, see `CCModularAdditionGate`.
+
+    Given a table of 2^w classical values below `N` and a state
+    |k>_w ⊗ φ(|b>_n ⊗ |0>_1) ⊗ |0>_n ⊗ |0>_1 with b < N in the Fourier basis,
+    computes |k>_w ⊗ φ(|(b+table[k]) mod N>_{n+1}) ⊗ |0>_n ⊗ |0>_1.
+
+    The value table[k] is loaded into the n-qubit lookup register by a
+    `TableLookupGate`. The doubly controlled additions of `CCModularAdditionGate`
+    are replaced by additions of that register, i.e. one `AdditionGate` of 2^j per
+    register qubit j, controlled by it. Afterwards, the lookup is uncomputed.
+    """
+
+    def __init__(self, table, N, width) -> None:
+        super().__init__()
+        self.table = tuple(int(value) for value in table)
+        assert all(0 <= value < N for value in self.table), "table must be below N"
+        self.window = len(self.table).bit_length() - 1
+        self.N = N
+        self.width = width
+        self.num_qubits = None
+        self._gate = None
+
+    def get_native(self) -> qk.circuit.Gate:
+        if not self._gate:
+            self._gate = GATE_CACHE.get(self._cache_key(), self._build_native)
+            self.num_qubits = self._gate.num_qubits
+
+        return self._gate
+
+    def _cache_key(self) -> tuple:
+        return (type(self).__name__, self.table, self.N, self.width)
+
+    def resource_estimate(self) -> ResourceEstimate:
+        """Upper bound on the resources of the native gate, independent of the
+        classical values, without building it"""
+        return _resource_estimate(self.window, self.width)
+
+    def _build_native(self) -> qk.circuit.Gate:
+        name = f"PhiADD(T[{len(self.table)}])MOD({self.N})"
+        return LazyGate(
+            name,
+            self.window + 2 * self.width + 2,
+            self._build_definition,
+            wrapper=self,
+        )
+
+    def _build_definition(self) -> qk.QuantumCircuit:
+        window_reg = qk.circuit.QuantumRegister(self.window, "window")
+        working_reg = qk.circuit.QuantumRegister(self.width + 1, "working")
+        lookup_reg = qk.circuit.AncillaRegister(self.width, "lookup")
+        ancilla_reg = qk.circuit.AncillaRegister(1, "ancilla")
+        qc = qk.QuantumCircuit(window_reg, working_reg, lookup_reg, ancilla_reg)
+        self._emit(qc, qc.qubits, flat=False)
+        return qc
+
+    def _emit(self, qc: qk.QuantumCircuit, qubits: list, flat: bool) -> None:
+        window_reg = qubits[: self.window]
+        working_reg = qubits[self.window : self.window + self.width + 1]
+        lookup_reg = qubits[self.window + self.width + 1 : -1]
+        ancilla_reg = qubits[-1:]
+
+        def qft(inverse=False):
+            append_qft(qc, working_reg, inverse=inverse, flat=flat)
+
+        def lookup():
+            table_lookup = TableLookupGate(self.table, self.width)
+            if flat:
+                table_lookup.emit_into(qc, window_reg + lookup_reg + ancilla_reg)
+            else:
+                qc.append(
+                    table_lookup.get_native(), window_reg + lookup_reg + ancilla_reg
+                )
+
+        def add(value, controls, inverse=False):
+            adder = AdditionGate(
+                value,
+                self.width,
+                apply_QFT=False,
+                num_controls=len(controls),
+                inverse=inverse,
+            )
+            if flat:
+                adder.emit_into(qc, controls + working_reg)
+            else:
+                qc.append(adder.get_native(), controls + working_reg)
+
+        def add_lookup(inverse=False):
+            for bit in range(self.width):
+                add(2**bit, [lookup_reg[bit]], inverse=inverse)
+
+        lookup()
+
+        add_lookup()
+        add(self.N, [], inverse=True)
+
+        qft(inverse=True)
+        qc.cx(working_reg[-1], ancilla_reg)
+        qft()
+
+        add(self.N, ancilla_reg)
+        add_lookup(inverse=True)
+
+        qft(inverse=True)
+        qc.x(working_reg[-1])
+        qc.cx(working_reg[-1], ancilla_reg)
+        qc.x(working_reg[-1])
+        qft()
+
+        add_lookup()
+
+        lookup()
+
+
+@lru_cache
+def _resource_estimate(window, width):
+    num_qubits = window + 2 * width + 2
+    lookup = TableLookupGate((0,) * 2**window, width).resource_estimate()
+    # The register qubit j adds phases to the width + 1 - j targets of the addition
+    # of 2^j. The additions of consecutive qubits overlap, one layer apart.
+    add_lookup = ResourceEstimate(
+        num_qubits, {"cp": width * (width + 3) // 2}, depth=2 * width
+    )
+    add = AdditionGate(0, width, apply_QFT=False).resource_estimate()
+    controlled_add = AdditionGate(
+        0, width, apply_QFT=False, num_controls=1
+    ).resource_estimate()
+    qft = qft_resource_estimate(width + 1)
+    copy_sign = ResourceEstimate(num_qubits, {"cx": 1}, depth=1)
+    copy_inverted_sign = ResourceEstimate(num_qubits, {"x": 2, "cx": 1}, depth=3)
+
+    return (
+        ResourceEstimate(num_qubits)
+        + lookup
+        + add_lookup
+        + add
+        + qft
+        + copy_sign
+        + qft
+        + controlled_add
+        + add_lookup
+        + qft
+        + copy_inverted_sign
+        + qft
+        + add_lookup
+        + lookup
+    )
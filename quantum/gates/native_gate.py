@@ -0,0 +1,73 @@
+import qiskit as qk
+
+from abc import ABC, abstractmethod
+
+from quantum.gates import GATE_CACHE
+
+from collections.abc import Callable
+
+
+class NativeGate(ABC):
+    """Common base of the gate wrappers in ´quantum.gates´.
+
+    Subclasses implement ´get_native´ and call ´super().__init__()´. The inverse and
+    controlled variants of the native gate are built once and memoized on the
+    instance. If the subclass defines a ´_cache_key´, they are additionally shared
+    between instances via GATE_CACHE.
+    """
+
+    def __init__(self) -> None:
+        self._derived_gates = {}
+
+    @abstractmethod
+    def get_native(self) -> qk.circuit.Gate:
+        pass
+
+    def get_inverse(self) -> qk.circuit.Gate:
+        return self._get_derived(("inverse",), lambda: self.get_native().inverse())
+
+    def get_controlled(
+        self, num_ctrl_qubits: int, inverse: bool = False
+    ) -> qk.circuit.Gate:
+        """Returns the native gate (or its inverse) controlled on ´num_ctrl_qubits´
+        additional qubits, which come first"""
+
+        def build():
+            gate = self.get_inverse() if inverse else self.get_native()
+            return gate.control(num_ctrl_qubits)
+
+        return self._get_derived(("control", num_ctrl_qubits, inverse), build)
+
+    def emit_into(self, qc: qk.QuantumCircuit, qubits, inverse: bool = False) -> None:
+        """Appends the operations of the native gate (or its inverse) directly to
+        ´qc´ on ´qubits´, recursively replacing sub-gates by their operations
+        instead of nesting them as opaque gates"""
+        qubits = list(qubits)
+        if inverse:
+            body = qk.QuantumCircuit(len(qubits))
+            self.emit_into(body, body.qubits)
+            qc.compose(body.inverse(), qubits, inplace=True)
+        else:
+            self._emit(qc, qubits, flat=True)
+
+    def _emit(self, qc: qk.QuantumCircuit, qubits: list, flat: bool) -> None:
+        """Appends the operations of the native gate to ´qc´ on ´qubits´, with
+        sub-gates either boxed or, if ´flat´, emitted in turn. By default, the
+        definition of the native gate is appended as is."""
+        qc.compose(self.get_native().definition, qubits, inplace=True)
+
+    def _cache_key(self) -> tuple | None:
+        return None
+
+    def _get_derived(
+        self, variant: tuple, build: Callable[[], qk.circuit.Gate]
+    ) -> qk.circuit.Gate:
+        if variant not in self._derived_gates:
+            cache_key = self._cache_key()
+            if cache_key is None:
+                self._derived_gates[variant] = build()
+            else:
+                self._derived_gates[variant] = GATE_CACHE.get(
+                    cache_key + variant, build
+                )
+        return self._derived_gates[variant]
@@ -0,0 +1,161 @@
+import qiskit as qk
+import qiskit.synthesis
+
+import math
+
+from collections import Counter
+from functools import lru_cache
+
+from quantum.resources import ResourceEstimate
+
+from quantum.gates import GATE_CACHE, LazyGate
+
+
+def qft_gate(
+    num_qubits: int, approximation_degree: int = 0, inverse: bool = False
+) -> qk.circuit.Gate:
+    """Returns the (inverse) QFT on ´num_qubits´ qubits. With a positive
+    ´approximation_degree´ d, all controlled rotations by angles pi / 2^k with
+    ´k > num_qubits - 1 - d´ are dropped, as in qiskit's approximate QFT."""
+
+    def build():
+        if approximation_degree == 0:
+            qft = qk.circuit.library.QFTGate(num_qubits)
+            return qft.inverse() if inverse else qft
+
+        qc = qk.synthesis.synth_qft_full(
+            num_qubits, approximation_degree=approximation_degree, inverse=inverse
+        )
+        gate = qc.to_gate()
+        gate.name = f"aqft({approximation_degree})" + ("_dg" if inverse else "")
+        return gate
+
+    return GATE_CACHE.get(("QFT", num_qubits, approximation_degree, inverse), build)
+
+
+def append_qft(
+    qc: qk.QuantumCircuit,
+    qubits,
+    approximation_degree: int = 0,
+    inverse: bool = False,
+    flat: bool = False,
+) -> None:
+    """Appends ´qft_gate´ to ´qc´ on ´qubits´. If ´flat´, its synthesized
+    definition is appended instead of the gate itself."""
+    gate = qft_gate(len(qubits), approximation_degree, inverse)
+    if flat:
+        qc.compose(gate.definition, qubits, inplace=True)
+    else:
+        qc.append(gate, qubits)
+
+
+@lru_cache
+def qft_resource_estimate(
+    num_qubits: int, approximation_degree: int = 0
+) -> ResourceEstimate:
+    """Resources of ´qft_gate´ (or its inverse) as synthesized by qiskit"""
+    max_exponent = max(0, max_rotation_exponent(num_qubits, approximation_degree))
+    # Qubit j is the target of min(j, max_exponent) controlled rotations
+    num_cp = sum(min(j, max_exponent) for j in range(num_qubits))
+    return ResourceEstimate(
+        num_qubits,
+        {"h": num_qubits, "cp": num_cp, "swap": num_qubits // 2},
+        depth=2 * num_qubits if num_qubits > 1 else 1,
+    )
+
+
+def max_rotation_exponent(num_qubits: int, approximation_degree: int) -> int:
+    """Largest k such that rotations by pi / 2^k are kept on ´num_qubits´ qubits"""
+    return num_qubits - 1 - approximation_degree
+
+
+def default_approximation_degree(num_qubits: int) -> int:
+    """Approximation degree keeping only rotations by pi / 2^k with
+    ´k <= log2(num_qubits) + 2´, the cutoff beyond which the dropped rotations no
+    longer affect the success probability of Shor's algorithm noticeably"""
+    max_exponent = math.ceil(math.log2(max(num_qubits, 1))) + 2
+    return max(0, num_qubits - 1 - max_exponent)
+
+
+def cancel_qft_pairs(qc: qk.QuantumCircuit) -> tuple[qk.QuantumCircuit, Counter]:
+    """Inlines all opaque sub-gates of ´qc´ (plain or lazy gates) down to
+    the QFTs and removes every QFT that directly follows its inverse on the same
+    qubits, i.e. with only operations on other qubits in between.
+
+    Returns the new circuit and, keyed by the index of every top-level instruction
+    in ´qc.data´, the number of QFTs removed from it."""
+    result = qc.copy_empty_like()
+    operations = []
+    origins = []
+    # Indices into ´operations´ of the operations acting on each qubit, in order
+    qubit_history = {qubit: [] for qubit in qc.qubits}
+    removed = Counter()
+
+    for origin, instruction in enumerate(qc.data):
+        for operation, qubits, clbits in _inline(
+            instruction.operation, instruction.qubits, instruction.clbits, result
+        ):
+            signature = _qft_signature(operation)
+            if signature is not None:
+                previous = {
+                    qubit_history[q][-1] if qubit_history[q] else None for q in qubits
+                }
+                if len(previous) == 1 and None not in previous:
+                    index = previous.pop()
+                    other, other_qubits, _ = operations[index]
+                    if other_qubits == qubits and _qft_signature(other) == (
+                        signature[0],
+                        not signature[1],
+                    ):
+                        operations[index] = None
+                        for q in qubits:
+                            qubit_history[q].pop()
+                        removed[origins[index]] += 1
+                        removed[origin] += 1
+                        continue
+
+            for q in qubits:
+                qubit_history[q].append(len(operations))
+            operations.append((operation, qubits, clbits))
+            origins.append(origin)
+
+    for entry in operations:
+        if entry is not None:
+            result.append(*entry)
+
+    return result, removed
+
+
+def _qft_signature(operation) -> tuple[str, bool] | None:
+    """Returns (name of the forward QFT, is inverse) for gates built by ´qft_gate´"""
+    name = operation.name
+    inverse = False
+    while name.endswith("_dg"):
+        name = name[: -len("_dg")]
+        inverse = not inverse
+    if name == "qft" or name.startswith("aqft("):
+        return (f"{name}_{operation.num_qubits}", inverse)
+    return None
+
+
+def _inline(operation, qubits, clbits, qc: qk.QuantumCircuit):
+    """Recursively yields the operations of plain ´Gate´ boxes except for QFTs,
+    adding the global phase of their definitions to ´qc´"""
+    if (
+        type(operation) not in (qk.circuit.Gate, LazyGate)
+        or operation.definition is None
+        or _qft_signature(operation) is not None
+    ):
+        yield operation, tuple(qubits), tuple(clbits)
+        return
+
+    definition = operation.definition
+    qc.global_phase += definition.global_phase
+    qubit_map = dict(zip(definition.qubits, qubits))
+    for instruction in definition.data:
+        yield from _inline(
+            instruction.operation,
+            [qubit_map[q] for q in instruction.qubits],
+            [],
+            qc,
+        )
@@ -0,0 +1,118 @@
+import qiskit as qk
+
+from quantum.gates import GATE_CACHE, LazyGate, NativeGate
+from quantum.resources import ResourceEstimate
+
+from functools import lru_cache
+from math import comb
+
+
+class TableLookupGate(NativeGate):
+    """Loads an entry of a classical table into a register (QROM).
+
+    Given a table of 2^w classical n-bit values and a state |k>_w ⊗ |y>_n ⊗ |0>_1,
+    computes |k>_w ⊗ |y xor table[k]>_n ⊗ |0>_1. The gate is its own inverse.
+
+    Every output bit is XORed with the positive polarity Reed-Muller expansion of
+    its column of the table, see `AutoOracleGate`. A monomial shared by more than
+    two output bits is computed into the ancilla once and fanned out with CX gates.
+    """
+
+    def __init__(self, table, width) -> None:
+        super().__init__()
+        self.table = tuple(int(value) for value in table)
+        self.window = len(self.table).bit_length() - 1
+        assert len(self.table) == 2**self.window, "table must have 2^w entries"
+        assert all(0 <= value < 2**width for value in self.table)
+        self.width = width
+        self.num_qubits = None
+        self._gate = None
+
+    def get_native(self) -> qk.circuit.Gate:
+        if not self._gate:
+            self._gate = GATE_CACHE.get(self._cache_key(), self._build_native)
+            self.num_qubits = self._gate.num_qubits
+
+        return self._gate
+
+    def _cache_key(self) -> tuple:
+        return (type(self).__name__, self.table, self.width)
+
+    def resource_estimate(self) -> ResourceEstimate:
+        """Upper bound on the resources of the native gate, independent of the
+        classical values, without building it"""
+        return _resource_estimate(self.window, self.width)
+
+    def reed_muller_outputs(self) -> list[int]:
+        """Returns, for every monomial of the window bits encoded as a bitmask, the
+        bitmask of the output bits whose Reed-Muller expansion contains it"""
+        outputs = list(self.table)
+        for bit in range(self.window):
+            for k in range(len(outputs)):
+                if k >> bit & 1:
+                    outputs[k] ^= outputs[k ^ (1 << bit)]
+        return outputs
+
+    def _build_native(self) -> qk.circuit.Gate:
+        return LazyGate(
+            f"LOOKUP(T[{len(self.table)}])",
+            self.window + self.width + 1,
+            self._build_definition,
+            wrapper=self,
+        )
+
+    def _build_definition(self) -> qk.QuantumCircuit:
+        window_reg = qk.circuit.QuantumRegister(self.window, "window")
+        output_reg = qk.circuit.QuantumRegister(self.width, "output")
+        ancilla_reg = qk.circuit.AncillaRegister(1, "ancilla")
+        qc = qk.QuantumCircuit(window_reg, output_reg, ancilla_reg)
+        self._emit(qc, qc.qubits, flat=False)
+        return qc
+
+    def _emit(self, qc: qk.QuantumCircuit, qubits: list, flat: bool) -> None:
+        window_reg = qubits[: self.window]
+        output_reg = qubits[self.window : self.window + self.width]
+        ancilla = qubits[-1]
+
+        for monomial, outputs in enumerate(self.reed_muller_outputs()):
+            targets = [
+                output_reg[bit] for bit in range(self.width) if outputs >> bit & 1
+            ]
+            controls = [
+                window_reg[bit] for bit in range(self.window) if monomial >> bit & 1
+            ]
+            if not targets:
+                continue
+
+            if len(controls) == 0:
+                qc.x(targets)
+            elif len(controls) == 1:
+                for target in targets:
+                    qc.cx(controls[0], target)
+            elif len(targets) <= 2:
+                for target in targets:
+                    qc.mcx(controls, target)
+            else:
+                qc.mcx(controls, ancilla)
+                for target in targets:
+                    qc.cx(ancilla, target)
+                qc.mcx(controls, ancilla)
+
+
+@lru_cache
+def _resource_estimate(window, width):
+    # Assumes that every monomial appears in the expansion of every output bit
+    estimate = ResourceEstimate(window + width + 1, {"x": width}, depth=1)
+    estimate += (
+        ResourceEstimate(window + width + 1, {"cx": width}, depth=width) * window
+    )
+    for size in range(2, window + 1):
+        mcx = "c" * size + "x"
+        if width <= 2:
+            monomial = ResourceEstimate(window + width + 1, {mcx: width}, depth=width)
+        else:
+            monomial = ResourceEstimate(
+                window + width + 1, {mcx: 2, "cx": width}, depth=width + 2
+            )
+        estimate += monomial * comb(window, size)
+    return estimate
@@ -0,0 +1,142 @@
+import qiskit as qk
+
+import math
+
+from quantum.gates import (
+    GATE_CACHE,
+    LazyGate,
+    NativeGate,
+    LookupModularAdditionGate,
+    append_qft,
+)
+from quantum.gates.qft import qft_resource_estimate
+from quantum.resources import ResourceEstimate
+
+from functools import lru_cache
+
+
+class WindowedModularMultiplicationGate(NativeGate):
+    """Windowed variant of the U_a gate, see `CModularInplaceMultiplicationGate`.
+
+    Given classical n-bit values `a`, `N` and |k>_w ⊗ |x>_n, computes
+    |k>_w ⊗ |(a^k x) mod N>_n, i.e. it multiplies by a^k for all `window` exponent
+    bits k at once. It is assumed that x < N and that `gcd(a,N)=1`.
+
+    Like U_a, it adds (a^k x) mod N to an ancilla register, swaps and subtracts
+    (a^-k a^k x) mod N. Each modular addition is a `LookupModularAdditionGate` that
+    adds (a^k x_i 2^(im)) mod N for a chunk x_i of `multiplicand_window` bits of x,
+    looked up from the w + m qubits of k and x_i into n more ancillas. This needs
+    n / m instead of w n modular additions. Since a^0 = 1, nothing needs to be
+    controlled and the swaps are plain swaps.
+    """
+
+    def __init__(self, a, N, width, window, multiplicand_window=2) -> None:
+        assert a < N, "a must be strictly smaller than N"
+        assert math.gcd(a, N) == 1, "gcd(a,N) must be equal to 1."
+        super().__init__()
+        self.a = a
+        self.N = N
+        self.width = width
+        self.window = window
+        self.multiplicand_window = multiplicand_window
+        self.num_qubits = None
+        self._gate = None
+
+    def get_native(self) -> qk.circuit.Gate:
+        if not self._gate:
+            self._gate = GATE_CACHE.get(self._cache_key(), self._build_native)
+            self.num_qubits = self._gate.num_qubits
+
+        return self._gate
+
+    def _cache_key(self) -> tuple:
+        return (
+            type(self).__name__,
+            self.a,
+            self.N,
+            self.width,
+            self.window,
+            self.multiplicand_window,
+        )
+
+    def resource_estimate(self) -> ResourceEstimate:
+        """Upper bound on the resources of the native gate, independent of the
+        classical values, without building it"""
+        return _resource_estimate(self.width, self.window, self.multiplicand_window)
+
+    def lookup_tables(self, a: int) -> list[tuple[int, ...]]:
+        """Returns, for every chunk of the multiplicand, the table of
+        (a^k x_i 2^(im)) mod N indexed by k + 2^w x_i"""
+        tables = []
+        for offset in range(0, self.width, self.multiplicand_window):
+            chunk = min(self.multiplicand_window, self.width - offset)
+            tables.append(
+                tuple(
+                    pow(a, k, self.N) * (x << offset) % self.N
+                    for x in range(2**chunk)
+                    for k in range(2**self.window)
+                )
+            )
+        return tables
+
+    def _build_native(self) -> qk.circuit.Gate:
+        name = f"U_a^k({self.a})MOD({self.N})"
+        return LazyGate(
+            name,
+            self.window + 3 * self.width + 2,
+            self._build_definition,
+            wrapper=self,
+        )
+
+    def _build_definition(self) -> qk.QuantumCircuit:
+        exponent_reg = qk.circuit.QuantumRegister(self.window, "exponent")
+        working_reg = qk.circuit.QuantumRegister(self.width, "working")
+        ancilla_reg = qk.circuit.AncillaRegister(2 * self.width + 2, "ancilla")
+        qc = qk.QuantumCircuit(exponent_reg, working_reg, ancilla_reg)
+        self._emit(qc, qc.qubits, flat=False)
+        return qc
+
+    def _emit(self, qc: qk.QuantumCircuit, qubits: list, flat: bool) -> None:
+        exponent_reg = qubits[: self.window]
+        working_reg = qubits[self.window : self.window + self.width]
+        ancilla_reg = qubits[self.window + self.width :]
+        b_reg = ancilla_reg[: self.width + 1]
+        # The sign qubit of the modular adder and the lookup register
+        mod_add_ancillas = ancilla_reg[self.width + 2 :] + [ancilla_reg[self.width + 1]]
+
+        def multiply_add(a, inverse=False):
+            # Put `b` into Fourier basis
+            append_qft(qc, b_reg, flat=flat)
+
+            tables = self.lookup_tables(a)
+            for chunk, table in enumerate(tables):
+                offset = chunk * self.multiplicand_window
+                x_chunk = working_reg[offset : offset + self.multiplicand_window]
+                mod_add = LookupModularAdditionGate(table, self.N, self.width)
+                mod_add_qubits = exponent_reg + x_chunk + b_reg + mod_add_ancillas
+                if flat:
+                    mod_add.emit_into(qc, mod_add_qubits, inverse=inverse)
+                elif inverse:
+                    qc.append(mod_add.get_inverse(), mod_add_qubits)
+                else:
+                    qc.append(mod_add.get_native(), mod_add_qubits)
+
+            # Put `b` into compute basis
+            append_qft(qc, b_reg, inverse=True, flat=flat)
+
+        multiply_add(self.a)
+        for bit in range(self.width):
+            qc.swap(working_reg[bit], b_reg[bit])
+        multiply_add(pow(self.a, -1, self.N), inverse=True)
+
+
+@lru_cache
+def _resource_estimate(width, window, multiplicand_window):
+    num_chunks = -(-width // multiplicand_window)
+    mod_add = LookupModularAdditionGate(
+        (0,) * 2 ** (window + multiplicand_window), 1, width
+    )
+    qft = qft_resource_estimate(width + 1)
+    multiply_add = qft + mod_add.resource_estimate() * num_chunks + qft
+    swaps = ResourceEstimate(window + 3 * width + 2, {"swap": width}, depth=1)
+    return multiply_add + swaps + multiply_add
@@ -0,0 +1,89 @@
+from collections import Counter
+
+
+class ResourceEstimate:
+    """Gate counts, number of qubits and an upper bound on the depth of a circuit,
+    computed without building it.
+
+    ´gate_counts´ is keyed by the gate type, e.g. ´"cp"´ or, for phases and X
+    gates with k controls, ´"c" * k + "p"´ and ´"c" * k + "x"´. Estimates compose
+    sequentially with ´+´, which adds counts and depths, and repeat with ´*´.
+    """
+
+    # CX counts of the gates after transpiling to {u, cx}. Gates not listed
+    # are single qubit gates or non-unitary operations.
+    CX_COST = {
+        "cx": 1,
+        "cp": 2,
+        "ccp": 6,
+        "swap": 3,
+        "cswap": 8,
+        "ccx": 6,
+        "cccx": 14,
+        "ccccx": 36,
+    }
+
+    def __init__(
+        self, num_qubits: int, gate_counts: dict[str, int] | None = None, depth: int = 0
+    ) -> None:
+        self.num_qubits = num_qubits
+        self.gate_counts = Counter(gate_counts or {})
+        self.depth = depth
+
+    def size(self) -> int:
+        return sum(self.gate_counts.values())
+
+    def cx_count(self) -> int:
+        """Number of CX gates after transpiling to {u, cx} without optimization"""
+        return sum(
+            count * ResourceEstimate.gate_cx_cost(name)
+            for name, count in self.gate_counts.items()
+        )
+
+    def gate_cx_cost(name: str) -> int:
+        if name in ResourceEstimate.CX_COST:
+            return ResourceEstimate.CX_COST[name]
+
+        num_controls = len(name) - len(name.lstrip("c"))
+        if name[num_controls:] in ("p", "x") and num_controls >= 3:
+            # Qiskit's decomposition of the multi-controlled phase, which also
+            # bounds the multi-controlled X with more than four controls
+            return 8 * num_controls**2 - 32 * num_controls + 44
+        return 0
+
+    def __add__(self, other: "ResourceEstimate") -> "ResourceEstimate":
+        return ResourceEstimate(
+            max(self.num_qubits, other.num_qubits),
+            self.gate_counts + other.gate_counts,
+            self.depth + other.depth,
+        )
+
+    def __mul__(self, times: int) -> "ResourceEstimate":
+        return ResourceEstimate(
+            self.num_qubits,
+            {name: count * times for name, count in self.gate_counts.items()},
+            self.depth * times,
+        )
+
+    __rmul__ = __mul__
+
+    def __sub__(self, other: "ResourceEstimate") -> "ResourceEstimate":
+        """Removes the gates of ´other´, e.g. after they cancelled. The depth bound
+        is kept as is."""
+        return ResourceEstimate(
+            self.num_qubits, self.gate_counts - other.gate_counts, self.depth
+        )
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, ResourceEstimate)
+            and self.num_qubits == other.num_qubits
+            and self.gate_counts == other.gate_counts
+            and self.depth == other.depth
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ResourceEstimate(num_qubits={self.num_qubits}, "
+            f"gate_counts={dict(self.gate_counts)}, depth={self.depth})"
+        )
@@ -0,0 +1,2 @@
+from quantum.simulators.order_finding_emulator import OrderFindingEmulator
+from quantum.simulators.basis_tracking_simulator import BasisTrackingSimulator
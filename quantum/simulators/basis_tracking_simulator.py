@@ -0,0 +1,395 @@
+import qiskit as qk
+import numpy as np
+
+from collections import Counter
+from collections.abc import Callable
+
+from qiskit.circuit.classical import expr
+
+from quantum.gates import (
+    AdditionGate,
+    CCModularAdditionGate,
+    CModularMultiplicationGate,
+    CModularInplaceMultiplicationGate,
+    WindowedModularMultiplicationGate,
+)
+
+
+class BasisTrackingSimulator:
+    # Amplitudes below this magnitude are dropped from the state
+    ATOL = 1e-12
+
+    def __init__(self, shots: int = 1, seed: int | None = None) -> None:
+        """Sparse simulator for circuits which keep few basis states populated,
+        like the order finding circuits built by ´Shor´.
+
+        The state is a dict from the basis index to its amplitude, holding only
+        non-zero amplitudes. Gates built by ´AdditionGate´, ´CCModularAdditionGate´,
+        ´CModularMultiplicationGate´, ´CModularInplaceMultiplicationGate´ and
+        ´WindowedModularMultiplicationGate´ are applied as the classical
+        permutations they implement, found via ´LazyGate.wrapper´, as long as every
+        populated basis state lies in their domain. Controlled gates only act on
+        the basis states with their controls set, gates on up to three qubits are
+        applied as small dense matrices, and everything else is replaced by its
+        definition. For the semiclassical circuit of ´Shor´, the memory thus scales
+        with the order r instead of 2^n. This does not hold for the static circuit,
+        whose counting register populates all 2^L states. It also does not hold for
+        parameterized or transpiled circuits, whose gates lost their ´wrapper´, so
+        that the QFTs of the work register are applied densely.
+
+        Supports measurements, resets, ´if_test´ and ´switch´ on bits or registers
+        and stores of bits. Conditions given as classical expressions are only
+        supported if they are a single bit. Every shot is simulated separately, and the counts are
+        keyed by the integer of all classical bits, like ´Counts.int_outcomes´.
+        """
+        self.shots = shots
+        self.rng = np.random.default_rng(seed)
+        self.state = None
+        self.clbits = None
+
+    def __call__(self, qc: qk.QuantumCircuit) -> dict[int, int]:
+        counts = Counter()
+        for _ in range(self.shots):
+            counts[self.run_shot(qc)] += 1
+        return dict(counts)
+
+    def run_circuits(self, circuits: list[qk.QuantumCircuit]) -> list[dict[int, int]]:
+        """Simulates several circuits, e.g. for ´Shor.run_batched´"""
+        return [self(qc) for qc in circuits]
+
+    def run_shot(self, qc: qk.QuantumCircuit) -> int:
+        """Simulates ´qc´ once from |0> and returns the measured classical bits"""
+        self.state = {0: 1.0 + 0.0j}
+        self.clbits = [0] * qc.num_clbits
+        qubits = {qubit: index for index, qubit in enumerate(qc.qubits)}
+        clbits = {clbit: index for index, clbit in enumerate(qc.clbits)}
+        self._run_block(qc, qubits, clbits)
+        return sum(bit << index for index, bit in enumerate(self.clbits))
+
+    def _run_block(self, qc: qk.QuantumCircuit, qubits: dict, clbits: dict) -> None:
+        for instruction in qc.data:
+            operation = instruction.operation
+            op_qubits = [qubits[qubit] for qubit in instruction.qubits]
+            op_clbits = [clbits[clbit] for clbit in instruction.clbits]
+
+            if operation.name == "measure":
+                self.clbits[op_clbits[0]] = self._measure(op_qubits[0])
+            elif operation.name == "reset":
+                if self._measure(op_qubits[0]):
+                    self._permute(op_qubits, lambda value: value ^ 1)
+            elif operation.name == "store":
+                self._store(operation, clbits)
+            elif isinstance(operation, qk.circuit.ControlFlowOp):
+                self._run_control_flow(instruction, qubits, clbits)
+            else:
+                self._apply(operation, op_qubits)
+
+    def _run_control_flow(self, instruction, qubits: dict, clbits: dict) -> None:
+        operation = instruction.operation
+        if operation.name == "if_else":
+            if isinstance(operation.condition, expr.Expr):
+                # Raises for anything but a single bit
+                condition = self._read_classical(operation.condition, clbits) == 1
+            else:
+                target, value = operation.condition
+                condition = self._read_classical(target, clbits) == value
+            if condition:
+                block = operation.blocks[0]
+            else:
+                block = operation.blocks[1] if len(operation.blocks) > 1 else None
+        elif operation.name == "switch_case":
+            value = self._read_classical(operation.target, clbits)
+            block = None
+            for values, case in operation.cases_specifier():
+                if value in values or qk.circuit.CASE_DEFAULT in values:
+                    block = case
+                    break
+        else:
+            raise NotImplementedError(f"{operation.name} is not supported")
+
+        if block is None:
+            return
+        block_qubits = {
+            inner: qubits[outer]
+            for inner, outer in zip(block.qubits, instruction.qubits)
+        }
+        block_clbits = dict(clbits)
+        block_clbits.update(
+            {
+                inner: clbits[outer]
+                for inner, outer in zip(block.clbits, instruction.clbits)
+            }
+        )
+        self._run_block(block, block_qubits, block_clbits)
+
+    def _read_classical(self, target, clbits: dict) -> int:
+        if isinstance(target, expr.Var):
+            target = target.var
+        elif isinstance(target, expr.Value):
+            return target.value
+
+        if isinstance(target, qk.circuit.Clbit):
+            return self.clbits[clbits[target]]
+        if isinstance(target, qk.circuit.ClassicalRegister):
+            return sum(
+                self.clbits[clbits[clbit]] << index
+                for index, clbit in enumerate(target)
+            )
+        raise NotImplementedError(f"Classical expression {target} is not supported")
+
+    def _store(self, operation, clbits: dict) -> None:
+        lvalue = operation.lvalue
+        if not (
+            isinstance(lvalue, expr.Var) and isinstance(lvalue.var, qk.circuit.Clbit)
+        ):
+            raise NotImplementedError(f"Store to {lvalue} is not supported")
+        self.clbits[clbits[lvalue.var]] = self._read_classical(operation.rvalue, clbits)
+
+    def _measure(self, qubit: int) -> int:
+        mask = 1 << qubit
+        norm = sum(abs(amplitude) ** 2 for amplitude in self.state.values())
+        probability = (
+            sum(
+                abs(amplitude) ** 2
+                for index, amplitude in self.state.items()
+                if index & mask
+            )
+            / norm
+        )
+        outcome = int(self.rng.random() < probability)
+
+        scale = 1 / np.sqrt(probability if outcome else 1 - probability)
+        self.state = {
+            index: amplitude * scale
+            for index, amplitude in self.state.items()
+            if bool(index & mask) == bool(outcome)
+        }
+        return outcome
+
+    def _apply(
+        self, operation, qubits: list[int], ctrl_mask: int = 0, ctrl_value: int = 0
+    ) -> None:
+        """Applies ´operation´ to the basis states whose bits in ´ctrl_mask´ equal
+        those of ´ctrl_value´"""
+        if operation.name in ["barrier", "delay", "id"]:
+            return
+
+        wrapper = getattr(operation, "wrapper", None)
+        permutation = _wrapper_permutation(wrapper) if wrapper else None
+        if permutation is not None and self._permute(
+            qubits, permutation, ctrl_mask, ctrl_value
+        ):
+            return
+
+        if isinstance(operation, qk.circuit.ControlledGate):
+            num_controls = operation.num_ctrl_qubits
+            for index, qubit in enumerate(qubits[:num_controls]):
+                ctrl_mask |= 1 << qubit
+                ctrl_value |= (operation.ctrl_state >> index & 1) << qubit
+            self._apply(
+                operation.base_gate, qubits[num_controls:], ctrl_mask, ctrl_value
+            )
+            return
+
+        if operation.num_qubits <= 3 and hasattr(operation, "__array__"):
+            self._apply_matrix(operation.to_matrix(), qubits, ctrl_mask, ctrl_value)
+            return
+
+        definition = operation.definition
+        if definition is None:
+            raise NotImplementedError(f"{operation.name} has no definition")
+        if definition.global_phase:
+            phase = np.exp(1j * float(definition.global_phase))
+            for index in self.state:
+                if index & ctrl_mask == ctrl_value:
+                    self.state[index] *= phase
+        inner = {qubit: outer for qubit, outer in zip(definition.qubits, qubits)}
+        for instruction in definition.data:
+            self._apply(
+                instruction.operation,
+                [inner[qubit] for qubit in instruction.qubits],
+                ctrl_mask,
+                ctrl_value,
+            )
+
+    def _permute(
+        self,
+        qubits: list[int],
+        permutation: Callable[[int], int | None],
+        ctrl_mask: int = 0,
+        ctrl_value: int = 0,
+    ) -> bool:
+        """Maps the value of ´qubits´ in every basis state by ´permutation´. Returns
+        False without changing the state if a value lies outside its domain."""
+        local_mask = sum(1 << qubit for qubit in qubits)
+        read, write = _reader(qubits), _writer(qubits)
+        state = {}
+        for index, amplitude in self.state.items():
+            if index & ctrl_mask != ctrl_value:
+                state[index] = amplitude
+                continue
+            value = permutation(read(index))
+            if value is None:
+                return False
+            state[(index & ~local_mask) | write(value)] = amplitude
+        self.state = state
+        return True
+
+    def _apply_matrix(
+        self, matrix: np.ndarray, qubits: list[int], ctrl_mask: int, ctrl_value: int
+    ) -> None:
+        local_mask = sum(1 << qubit for qubit in qubits)
+        read = _reader(qubits)
+        spread = [_spread(value, qubits) for value in range(matrix.shape[0])]
+
+        if np.count_nonzero(matrix - np.diag(np.diagonal(matrix))) == 0:
+            diagonal = np.diagonal(matrix)
+            for index in self.state:
+                if index & ctrl_mask == ctrl_value:
+                    self.state[index] *= diagonal[read(index)]
+            return
+
+        if len(qubits) == 1:
+            self._apply_single_qubit_matrix(matrix, qubits[0], ctrl_mask, ctrl_value)
+            return
+
+        groups = {}
+        for index, amplitude in self.state.items():
+            if index & ctrl_mask == ctrl_value:
+                rest = index & ~local_mask
+                groups.setdefault(rest, {})[read(index)] = amplitude
+
+        for rest, local in groups.items():
+            vector = np.zeros(matrix.shape[0], dtype=complex)
+            for value, amplitude in local.items():
+                vector[value] = amplitude
+                del self.state[rest | spread[value]]
+            for value, amplitude in enumerate(matrix @ vector):
+                if abs(amplitude) > BasisTrackingSimulator.ATOL:
+                    self.state[rest | spread[value]] = amplitude
+
+    def _apply_single_qubit_matrix(
+        self, matrix: np.ndarray, qubit: int, ctrl_mask: int, ctrl_value: int
+    ) -> None:
+        (u00, u01), (u10, u11) = matrix.tolist()
+        bit = 1 << qubit
+        state = {}
+        for index, amplitude in self.state.items():
+            if index & ctrl_mask != ctrl_value:
+                state[index] = amplitude
+                continue
+            zero = index & ~bit
+            if zero in state:
+                continue
+            # Both indices of the pair are written, so it is skipped at the other
+            a0, a1 = self.state.get(zero, 0), self.state.get(zero | bit, 0)
+            state[zero] = u00 * a0 + u01 * a1
+            state[zero | bit] = u10 * a0 + u11 * a1
+        self.state = {
+            index: amplitude
+            for index, amplitude in state.items()
+            if abs(amplitude) > BasisTrackingSimulator.ATOL
+        }
+
+
+def _reader(qubits: list[int]) -> Callable[[int], int]:
+    """Returns the function extracting the value of ´qubits´ from a basis index"""
+    if qubits == list(range(qubits[0], qubits[0] + len(qubits))):
+        shift, mask = qubits[0], (1 << len(qubits)) - 1
+        return lambda index: index >> shift & mask
+    return lambda index: sum(
+        (index >> qubit & 1) << bit for bit, qubit in enumerate(qubits)
+    )
+
+
+def _writer(qubits: list[int]) -> Callable[[int], int]:
+    """Returns the function placing a value of ´qubits´ at their positions"""
+    if qubits == list(range(qubits[0], qubits[0] + len(qubits))):
+        shift = qubits[0]
+        return lambda value: value << shift
+    return lambda value: _spread(value, qubits)
+
+
+def _spread(value: int, qubits: list[int]) -> int:
+    return sum((value >> bit & 1) << qubit for bit, qubit in enumerate(qubits))
+
+
+def _wrapper_permutation(wrapper) -> Callable[[int], int | None] | None:
+    """Returns the classical permutation of the basis states implemented by the
+    native gate of ´wrapper´, on the value of all its qubits. The permutation
+    returns None outside of the domain on which the gate is a permutation."""
+    if getattr(wrapper, "approximation_degree", 0) > 0:
+        return None
+    if hasattr(wrapper, "is_parameterized") and wrapper.is_parameterized():
+        return None
+
+    if isinstance(wrapper, AdditionGate):
+        if not wrapper.apply_QFT:
+            return None
+        controls = 2**wrapper.num_controls - 1
+        modulus = 2 ** (wrapper.width + 1)
+        a = -wrapper.a if wrapper.inverse else wrapper.a
+
+        def add(value):
+            if value & controls != controls:
+                return value
+            b = value >> wrapper.num_controls
+            return controls | ((b + a) % modulus) << wrapper.num_controls
+
+        return add
+
+    if isinstance(wrapper, CCModularAdditionGate):
+        if not wrapper.apply_QFT:
+            return None
+        a, N, width = wrapper.a, wrapper.N, wrapper.width
+
+        def modular_add(value):
+            b, ancilla = value >> 2 & (2 ** (width + 1) - 1), value >> (width + 3)
+            if b >= N or ancilla != 0:
+                return None
+            if value & 3 != 3:
+                return value
+            return 3 | ((b + a) % N) << 2
+
+        return modular_add
+
+    if isinstance(wrapper, CModularMultiplicationGate):
+        a, N, width = wrapper.a, wrapper.N, wrapper.width
+
+        def multiply_add(value):
+            x = value >> 1 & (2**width - 1)
+            b = value >> (width + 1) & (2 ** (width + 1) - 1)
+            if b >= N or value >> (2 * width + 2) != 0:
+                return None
+            if value & 1 == 0:
+                return value
+            return 1 | x << 1 | ((b + a * x) % N) << (width + 1)
+
+        return multiply_add
+
+    if isinstance(wrapper, CModularInplaceMultiplicationGate):
+        a, N, width = wrapper.a, wrapper.N, wrapper.width
+
+        def multiply(value):
+            x = value >> 1 & (2**width - 1)
+            if x >= N or value >> (width + 1) != 0:
+                return None
+            if value & 1 == 0:
+                return value
+            return 1 | (a * x % N) << 1
+
+        return multiply
+
+    if isinstance(wrapper, WindowedModularMultiplicationGate):
+        a, N, width, window = wrapper.a, wrapper.N, wrapper.width, wrapper.window
+
+        def windowed_multiply(value):
+            k = value & (2**window - 1)
+            x = value >> window & (2**width - 1)
+            if x >= N or value >> (window + width) != 0:
+                return None
+            return k | (pow(a, k, N) * x % N) << window
+
+        return windowed_multiply
+
+    return None
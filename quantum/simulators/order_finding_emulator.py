@@ -0,0 +1,105 @@
+import qiskit as qk
+import numpy as np
+
+from math import gcd, lcm
+from functools import lru_cache
+from collections import Counter
+
+from quantum.algorithms.prescreening import prime_factorization
+
+
+class OrderFindingEmulator:
+    # Outcomes further than this from the peak are sampled from the tail of the
+    # distribution, which holds a fraction of about 1 / (pi^2 WINDOW)
+    WINDOW = 2048
+
+    def __init__(self, shots: int = 1, seed: int | None = None) -> None:
+        """Emulates the circuits built by ´Shor´ without simulating any qubit.
+
+        An ideal order finding circuit for the base a measures y with probability
+        1/r sum_s |1/2^L sum_x exp(2 pi i x (s/r - y/2^L))|^2, where r is the order
+        of a modulo N. The emulator computes r classically, from the prime
+        factorizations of N and of its Carmichael function, and samples ´shots´
+        outcomes from that distribution. It reads a, N and L from the metadata of
+        the circuit and returns the counts keyed by the measured integer, like
+        ´Counts.int_outcomes´. The order must be below 2^63.
+        """
+        self.shots = shots
+        self.rng = np.random.default_rng(seed)
+
+    def __call__(self, qc: qk.QuantumCircuit) -> dict[int, int]:
+        return self.sample(qc.metadata["a"], qc.metadata["N"], qc.metadata["L"])
+
+    def run_circuits(self, circuits: list[qk.QuantumCircuit]) -> list[dict[int, int]]:
+        """Emulates several circuits, e.g. for ´Shor.run_batched´"""
+        return [self(qc) for qc in circuits]
+
+    def sample(self, a: int, N: int, L: int) -> dict[int, int]:
+        r = multiplicative_order(a, N)
+        counts = Counter()
+        for s, shots in Counter(self.rng.integers(r, size=self.shots)).items():
+            for outcome in self._sample_phase(int(s), r, L, shots):
+                counts[outcome] += 1
+        return dict(counts)
+
+    def _sample_phase(self, s: int, r: int, L: int, shots: int) -> list[int]:
+        """Samples the outcomes of the phase estimation of s / r with L bits"""
+        # s / r 2^L = peak + delta with 0 <= delta < 1, computed exactly
+        peak, remainder = divmod(s << L, r)
+        if remainder == 0:
+            return [peak] * shots
+        delta = remainder / r
+
+        window = min(OrderFindingEmulator.WINDOW, 2 ** (L - 1))
+        offsets = np.arange(-window + 1, window + 1)
+        probabilities = (
+            np.sin(np.pi * delta) ** 2
+            / (2**L * np.sin(np.pi * (delta - offsets) / 2**L)) ** 2
+        )
+        if window == 2 ** (L - 1):
+            # The window covers all outcomes
+            probabilities /= probabilities.sum()
+        tail = max(0.0, 1.0 - probabilities.sum())
+
+        samples = self.rng.random(shots)
+        in_window = samples < 1.0 - tail
+        cumulative = np.cumsum(probabilities)
+        indices = np.minimum(
+            np.searchsorted(cumulative, samples[in_window], side="right"),
+            offsets.size - 1,
+        )
+
+        outcomes = [(peak + int(offsets[index])) % 2**L for index in indices]
+        for _ in range(shots - len(outcomes)):
+            # The tail decays like 1 / (offset - delta)^2 on both sides
+            distance = window / self.rng.random()
+            if self.rng.random() < 0.5:
+                offset = int(np.floor(delta + distance)) + 1
+            else:
+                offset = int(np.ceil(delta - distance)) - 1
+            outcomes.append((peak + offset) % 2**L)
+        return outcomes
+
+
+@lru_cache
+def multiplicative_order(a: int, N: int) -> int:
+    """Returns the smallest r > 0 with a^r = 1 mod N"""
+    if gcd(a, N) != 1:
+        raise ValueError(f"{a} is not invertible modulo {N}")
+
+    r = carmichael(N)
+    for p in prime_factorization(r):
+        while r % p == 0 and pow(a, r // p, N) == 1:
+            r //= p
+    return r
+
+
+def carmichael(N: int) -> int:
+    """Returns the exponent of the multiplicative group modulo N"""
+    result = 1
+    for p, k in prime_factorization(N).items():
+        if p == 2 and k >= 3:
+            result = lcm(result, 2 ** (k - 2))
+        else:
+            result = lcm(result, (p - 1) * p ** (k - 1))
+    return result
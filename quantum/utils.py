@@ -1,8 +1,14 @@
 import string
+import qiskit as qk
+import qiskit.synthesis
 from qiskit.quantum_info import Statevector
 
 import numpy as np
 
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Callable
+
 
 def combine_basis_state(q_0: int, q_1: int, dim_q0: int) -> int:
     """Given two basis states ´q_0´ and ´q_1´ in spaces of dimension ´2 ** dim_qi´
@@ -69,3 +75,68 @@ def get_bitmask(x, width, big_endian=True):
         return mask[::-1]
     else:
         return mask
+
+
+def tabulate(
+    f: Callable,
+    num_bits: int,
+    vectorized: bool = False,
+    num_workers: int | None = None,
+) -> np.ndarray:
+    """Evaluates ´f´ on all basis states ´x < 2 ** num_bits´ and returns the values as
+    an array. A ´vectorized´ f is called once with the array of all basis states.
+    Otherwise, f is called once per basis state, fanned out in chunks over a pool of
+    ´num_workers´ processes if given, in which case f has to be picklable."""
+    size = 2**num_bits
+    if vectorized:
+        values = f(np.arange(size, dtype=np.int64))
+    elif num_workers is not None and num_workers > 1:
+        chunksize = max(1, size // (4 * num_workers))
+        with ProcessPoolExecutor(num_workers) as executor:
+            values = list(executor.map(f, range(size), chunksize=chunksize))
+    else:
+        values = np.fromiter((f(x) for x in range(size)), dtype=np.int64, count=size)
+
+    return np.asarray(values, dtype=np.int64)
+
+
+def append_mcx(
+    qc: qk.QuantumCircuit,
+    controls: list[int],
+    target: int,
+    ancillas: list[int],
+    dirty_ancillas: bool = False,
+) -> None:
+    """Appends a multi-controlled X to ´qc´. If ´ancillas´ are given, gates with
+    more than two controls are decomposed at linear instead of quadratic cost.
+    The ancillas are restored and have to start in |0> unless ´dirty_ancillas´."""
+    if len(ancillas) == 0 or len(controls) <= 2:
+        qc.mcx(controls, target)
+        return
+
+    mcx_gate = _ancilla_mcx_gate(len(controls), len(ancillas), dirty_ancillas)
+    num_used_ancillas = mcx_gate.num_qubits - len(controls) - 1
+    qc.append(mcx_gate, controls + [target] + ancillas[:num_used_ancillas])
+
+
+@lru_cache
+def _ancilla_mcx_gate(
+    num_ctrl_qubits: int, num_ancillas: int, dirty_ancillas: bool
+) -> qk.circuit.Gate:
+    """Multi-controlled X on ´num_ctrl_qubits´ controls, followed by the target and
+    the ancillas it uses. With enough ancillas this is the V-chain of relative-phase
+    Toffolis, otherwise the single ancilla construction of Khattar and Gidney."""
+    if num_ancillas >= num_ctrl_qubits - 2:
+        if dirty_ancillas:
+            qc = qk.synthesis.synth_mcx_n_dirty_i15(num_ctrl_qubits)
+        else:
+            qc = qk.synthesis.synth_mcx_n_clean_m15(num_ctrl_qubits)
+    else:
+        if dirty_ancillas:
+            qc = qk.synthesis.synth_mcx_1_dirty_kg24(num_ctrl_qubits)
+        else:
+            qc = qk.synthesis.synth_mcx_1_clean_kg24(num_ctrl_qubits)
+
+    gate = qc.to_gate()
+    gate.name = f"mcx_{num_ctrl_qubits}"
+    return gate
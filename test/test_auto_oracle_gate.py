@@ -1,5 +1,8 @@
 import pytest
 
+import numpy as np
+import numpy.testing as npt
+
 from helper import test_matrix_using_basis, get_matrix_representation
 
 from quantum.gates import AutoOracleGate
@@ -80,3 +83,87 @@ def test_auto_oracle_gate(f, n, m):
     matrix = get_matrix_representation(native_gate)
 
     test_matrix_using_basis(matrix, validation)
+
+
+@pytest.mark.parametrize(
+    "f, n, m, num_ancillas",
+    [
+        (f_1_1_const_zero, 1, 1, 0),
+        (f_1_1_const_one, 1, 1, 0),
+        (f_1_1_0_1, 1, 1, 0),
+        (f_2_1_balanced, 2, 1, 0),
+        (f, 4, 4, 0),
+        (g, 3, 5, 0),
+        (lambda x: (x * 7) % 16, 4, 4, 1),
+    ],
+)
+def test_auto_oracle_gate_reed_muller(f, n, m, num_ancillas):
+    def validation(x):
+        q_0, q_1 = reduce_basis_state(x, n)
+        r = combine_basis_state(q_0, q_1 ^ f(q_0), n)
+        return r
+
+    gate = AutoOracleGate(
+        f,
+        n,
+        m,
+        num_ancillas=num_ancillas,
+        synthesis=AutoOracleGate.Synthesis.ReedMuller,
+    )
+    native_gate = gate.get_native()
+    matrix = get_matrix_representation(native_gate)
+
+    # Only the subspace with clean ancillas in |0> is relevant
+    dimension = 2 ** (n + m)
+    test_matrix_using_basis(matrix[:dimension, :dimension], validation)
+
+
+@pytest.mark.parametrize(
+    "column, n, expected_result",
+    [
+        ([0, 0, 0, 0], 2, [0, 0, 0, 0]),
+        ([1, 1, 1, 1], 2, [1, 0, 0, 0]),
+        ([0, 1, 1, 0], 2, [0, 1, 1, 0]),
+        ([0, 0, 0, 1], 2, [0, 0, 0, 1]),
+        ([1, 0, 0, 0, 0, 0, 0, 0], 3, [1, 1, 1, 1, 1, 1, 1, 1]),
+    ],
+)
+def test_reed_muller_coefficients(column, n, expected_result):
+    result = AutoOracleGate._reed_muller_coefficients(
+        np.array(column, dtype=np.uint8), n
+    )
+    npt.assert_equal(result, expected_result)
+
+
+@pytest.mark.parametrize(
+    "synthesis",
+    [AutoOracleGate.Synthesis.Permutation, AutoOracleGate.Synthesis.ReedMuller],
+)
+@pytest.mark.parametrize(
+    "f, n, m, vectorized, num_workers",
+    [
+        (lambda x: x ^ (x >> 1), 3, 3, True, None),
+        (lambda x: (x * 5) % 8, 3, 3, True, None),
+        (f, 4, 4, False, 2),
+        (g, 3, 5, False, 2),
+    ],
+)
+def test_auto_oracle_gate_batch_evaluation(f, n, m, vectorized, num_workers, synthesis):
+    gate = AutoOracleGate(
+        f, n, m, synthesis=synthesis, vectorized=vectorized, num_workers=num_workers
+    )
+    expected_truth_table = [int(f(x)) for x in range(2**n)]
+    npt.assert_equal(gate.get_truth_table(), expected_truth_table)
+
+    def validation(x):
+        q_0, q_1 = reduce_basis_state(x, n)
+        return combine_basis_state(q_0, q_1 ^ expected_truth_table[q_0], n)
+
+    matrix = get_matrix_representation(gate.get_native())
+    test_matrix_using_basis(matrix, validation)
+
+
+def test_auto_oracle_gate_invalid_function():
+    gate = AutoOracleGate(lambda x: 2, 2, 1)
+    with pytest.raises(ValueError):
+        gate.get_truth_table()
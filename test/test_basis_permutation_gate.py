@@ -1,5 +1,6 @@
 import pytest
 
+import numpy as np
 import qiskit as qk
 
 from helper import test_matrix_using_basis, get_matrix_representation
@@ -68,7 +69,7 @@ def g(x: int) -> int:
         (0, 7, 3),
     ],
 )
-def test_add_swap_basis_states_circuit(a, b, num_qubits):
+def test_swap_basis_states_operations(a, b, num_qubits):
     def validation(x):
         if x == a:
             return b
@@ -79,7 +80,7 @@ def test_add_swap_basis_states_circuit(a, b, num_qubits):
 
     gate = BasisPermutationGate(lambda x: x, num_qubits)
     qc = qk.QuantumCircuit(num_qubits)
-    gate._add_swap_basis_states_circuit(qc, a, b)
+    gate._add_flip_operations_circuit(qc, gate._swap_basis_states_operations(a, b))
     matrix = get_matrix_representation(qc)
 
     test_matrix_using_basis(matrix, validation)
@@ -99,3 +100,145 @@ def test_basis_permutation_gate(f, num_qubits):
     matrix = get_matrix_representation(native_gate)
 
     test_matrix_using_basis(matrix, f)
+
+
+@pytest.mark.parametrize(
+    "permutation, expected_cycles",
+    [
+        (np.array([0, 1, 2, 3]), []),
+        (np.array([1, 0, 3, 2]), [[0, 1], [2, 3]]),
+        (np.array([7, 4, 5, 2, 0, 1, 6, 3]), [[0, 7, 3, 2, 5, 1, 4]]),
+    ],
+)
+def test_permutation_get_cycles(permutation, expected_cycles):
+    cycles = BasisPermutationGate._permutation_get_cycles(permutation)
+    assert [cycle.tolist() for cycle in cycles] == expected_cycles
+
+
+@pytest.mark.parametrize(
+    "f, num_qubits, vectorized",
+    [
+        (np.array([7, 4, 5, 2, 0, 1, 6, 3]), 3, False),
+        (lambda x: (x + 1) % 16, 4, True),
+        (lambda x: x ^ 5, 3, True),
+    ],
+)
+def test_basis_permutation_gate_array_input(f, num_qubits, vectorized):
+    gate = BasisPermutationGate(f, num_qubits, vectorized=vectorized)
+    permutation = gate.get_permutation()
+    native_gate = gate.get_native()
+    matrix = get_matrix_representation(native_gate)
+
+    test_matrix_using_basis(matrix, lambda x: permutation[x])
+
+
+@pytest.mark.parametrize(
+    "f, num_qubits",
+    [
+        (np.array([0, 0, 1, 2]), 2),
+        (np.array([0, 1, 2]), 2),
+        (lambda x: 0, 2),
+    ],
+)
+def test_basis_permutation_gate_invalid_permutation(f, num_qubits):
+    gate = BasisPermutationGate(f, num_qubits)
+    with pytest.raises(ValueError):
+        gate.get_permutation()
+
+
+@pytest.mark.parametrize(
+    "f, num_qubits",
+    [
+        (lambda x: x, 3),
+        (f, 3),
+        (g, 4),
+        (np.random.default_rng(0).permutation(16), 4),
+    ],
+)
+def test_basis_permutation_gate_gray_code(f, num_qubits):
+    gate = BasisPermutationGate(
+        f, num_qubits, synthesis=BasisPermutationGate.Synthesis.GrayCode
+    )
+    permutation = gate.get_permutation()
+    native_gate = gate.get_native()
+    matrix = get_matrix_representation(native_gate)
+
+    test_matrix_using_basis(matrix, lambda x: permutation[x])
+
+
+@pytest.mark.parametrize("num_qubits", [4, 6, 8])
+def test_gray_code_reduces_mcx_count(num_qubits):
+    permutation = np.random.default_rng(num_qubits).permutation(2**num_qubits)
+    transpositions = BasisPermutationGate(permutation, num_qubits)
+    gray_code = BasisPermutationGate(
+        permutation, num_qubits, synthesis=BasisPermutationGate.Synthesis.GrayCode
+    )
+
+    assert gray_code.count_mcx() < transpositions.count_mcx()
+
+
+@pytest.mark.parametrize(
+    "f, num_qubits, num_ancillas, dirty_ancillas",
+    [
+        (g, 4, 1, False),
+        (g, 4, 1, True),
+        (np.random.default_rng(1).permutation(32), 5, 1, True),
+        (np.random.default_rng(1).permutation(32), 5, 2, True),
+        (np.random.default_rng(2).permutation(32), 5, 2, False),
+    ],
+)
+def test_basis_permutation_gate_with_ancillas(
+    f, num_qubits, num_ancillas, dirty_ancillas
+):
+    gate = BasisPermutationGate(
+        f, num_qubits, num_ancillas=num_ancillas, dirty_ancillas=dirty_ancillas
+    )
+    permutation = gate.get_permutation()
+    native_gate = gate.get_native()
+    matrix = get_matrix_representation(native_gate)
+
+    def validation(x):
+        working = x % 2**num_qubits
+        return x - working + permutation[working]
+
+    if dirty_ancillas:
+        test_matrix_using_basis(matrix, validation)
+    else:
+        # Clean ancillas only have to be restored when they start in |0>
+        dimension = 2**num_qubits
+        test_matrix_using_basis(matrix[:dimension, :dimension], validation)
+
+
+def test_ancillas_reduce_cx_count():
+    permutation = np.random.default_rng(3).permutation(2**6)
+
+    def cx_count(num_ancillas):
+        gate = BasisPermutationGate(permutation, 6, num_ancillas=num_ancillas)
+        qc = qk.QuantumCircuit(gate.get_native().num_qubits)
+        qc.append(gate.get_native(), range(qc.num_qubits))
+        qct = qk.transpile(qc, basis_gates=["cx", "u"], optimization_level=0)
+        return qct.count_ops()["cx"]
+
+    assert cx_count(4) <= cx_count(1) < cx_count(0)
+
+
+@pytest.mark.parametrize(
+    "synthesis",
+    [
+        BasisPermutationGate.Synthesis.Transpositions,
+        BasisPermutationGate.Synthesis.GrayCode,
+    ],
+)
+def test_cancel_flips(synthesis):
+    permutation = np.random.default_rng(4).permutation(2**4)
+    gate = BasisPermutationGate(permutation, 4, synthesis=synthesis)
+    uncancelled_gate = BasisPermutationGate(
+        permutation, 4, synthesis=synthesis, cancel_flips=False
+    )
+
+    matrix = get_matrix_representation(gate.get_native())
+    test_matrix_using_basis(matrix, lambda x: permutation[x])
+
+    num_flips = gate.get_native().definition.count_ops()["x"]
+    num_uncancelled_flips = uncancelled_gate.get_native().definition.count_ops()["x"]
+    assert num_flips < num_uncancelled_flips
@@ -0,0 +1,120 @@
+import pytest
+import math
+
+import qiskit as qk
+import numpy as np
+import numpy.testing as npt
+
+from qiskit.circuit.classical import expr
+from qiskit.quantum_info import Statevector
+
+from quantum.algorithms import Shor, Prescreening
+from quantum.gates import (
+    AdditionGate,
+    CCModularAdditionGate,
+    CModularMultiplicationGate,
+    CModularInplaceMultiplicationGate,
+    WindowedModularMultiplicationGate,
+)
+from quantum.simulators import BasisTrackingSimulator
+from quantum.simulators.basis_tracking_simulator import _wrapper_permutation
+
+
+def final_state(qc: qk.QuantumCircuit) -> np.ndarray:
+    simulator = BasisTrackingSimulator()
+    simulator.run_shot(qc)
+    state = np.zeros(2**qc.num_qubits, dtype=complex)
+    for index, amplitude in simulator.state.items():
+        state[index] = amplitude
+    return state
+
+
+def test_dense_gates():
+    qc = qk.QuantumCircuit(3)
+    qc.h(0)
+    qc.cx(0, 1)
+    qc.rz(0.3, 1)
+    qc.cswap(1, 0, 2)
+    qc.mcp(0.7, [0, 2], 1)
+    qc.ry(1.1, 2)
+    qc.append(qk.circuit.library.QFTGate(3), [0, 1, 2])
+
+    npt.assert_allclose(final_state(qc), Statevector(qc).data, atol=1e-10)
+
+
+@pytest.mark.parametrize(
+    "gate, input",
+    [
+        (AdditionGate(5, 3, apply_QFT=True, num_controls=1), 1 | 6 << 1),
+        (AdditionGate(5, 3, apply_QFT=True, inverse=True), 2),
+        (CCModularAdditionGate(4, 7, 3, apply_QFT=True), 3 | 5 << 2),
+        (CModularMultiplicationGate(3, 7, 3), 1 | 5 << 1 | 2 << 4),
+        (CModularInplaceMultiplicationGate(3, 7, 3), 1 | 5 << 1),
+        (WindowedModularMultiplicationGate(2, 7, 3, 2), 3 | 5 << 2),
+    ],
+)
+def test_permutations(gate, input):
+    # The permutation of the wrapper agrees with the definition of the gate
+    assert _wrapper_permutation(gate) is not None
+    native = gate.get_native()
+    qc = qk.QuantumCircuit(native.num_qubits)
+    for qubit in range(native.num_qubits):
+        if input >> qubit & 1:
+            qc.x(qubit)
+    qc.append(native, qc.qubits)
+
+    npt.assert_allclose(final_state(qc), Statevector(qc).data, atol=1e-7)
+
+
+def test_classical_control():
+    qc = qk.QuantumCircuit(2, 2)
+    qc.x(0)
+    qc.measure(0, 0)
+    qc.reset(0)
+    with qc.if_test((qc.clbits[0], 1)):
+        qc.x(1)
+    qc.measure(1, 1)
+
+    assert BasisTrackingSimulator(shots=8, seed=0)(qc) == {3: 8}
+
+
+def test_expression_conditions():
+    qc = qk.QuantumCircuit(2, 2)
+    qc.x(0)
+    qc.measure(0, 0)
+    with qc.if_test(expr.lift(qc.clbits[0])):
+        qc.x(1)
+    qc.measure(1, 1)
+
+    assert BasisTrackingSimulator(shots=8, seed=0)(qc) == {3: 8}
+
+    with qc.if_test(expr.logic_and(qc.clbits[0], qc.clbits[1])):
+        qc.x(0)
+    with pytest.raises(NotImplementedError):
+        BasisTrackingSimulator()(qc)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"correction": Shor.Correction.Lookup},
+        {"phase_estimation": Shor.PhaseEstimation.Static, "window_size": 2},
+    ],
+)
+def test_shor_circuit(kwargs):
+    algorithm = Shor(15, prescreening=Prescreening(stages=[]), **kwargs)
+
+    counts = BasisTrackingSimulator(shots=32, seed=0)(algorithm._build_circuit(7))
+
+    assert {outcome % 2**8 for outcome in counts} <= {0, 64, 128, 192}
+
+
+def test_shor_large():
+    # 33 qubits, but the work register holds at most r basis states
+    N = 127 * 131
+    algorithm = Shor(N, prescreening=Prescreening(stages=[]))
+
+    result = algorithm.run(BasisTrackingSimulator(shots=2, seed=0))
+    assert math.prod(result) == N
+    assert 1 < result[0] < N
@@ -0,0 +1,105 @@
+import pytest
+
+import numpy as np
+import numpy.testing as npt
+
+from qiskit.quantum_info import Operator
+
+from quantum.gates import (
+    GateCache,
+    GATE_CACHE,
+    AdditionGate,
+    BasisPermutationGate,
+    CModularInplaceMultiplicationGate,
+    LookupModularAdditionGate,
+    NativeGate,
+)
+
+
+def test_gate_cache_statistics():
+    cache = GateCache(maxsize=2)
+    builds = []
+
+    def build(name):
+        def _build():
+            builds.append(name)
+            return name
+
+        return _build
+
+    assert cache.get("a", build("a")) == "a"
+    assert cache.get("a", build("a")) == "a"
+    assert cache.get("b", build("b")) == "b"
+    assert builds == ["a", "b"]
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 2, "maxsize": 2}
+
+    # `a` was used least recently and is evicted
+    cache.get("b", build("b"))
+    cache.get("c", build("c"))
+    assert "a" not in cache
+    assert "b" in cache and "c" in cache
+
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 2}
+
+
+def test_gate_cache_shares_gates():
+    GATE_CACHE.clear()
+
+    addition = AdditionGate(3, 3, apply_QFT=True).get_native()
+    assert AdditionGate(3, 3, apply_QFT=True).get_native() is addition
+    assert AdditionGate(3, 3, apply_QFT=False).get_native() is not addition
+
+    mult = CModularInplaceMultiplicationGate(7, 15, 4).get_native()
+    misses = GATE_CACHE.misses
+    assert CModularInplaceMultiplicationGate(7, 15, 4).get_native() is mult
+    assert GATE_CACHE.misses == misses
+    assert GATE_CACHE.hits > 0
+
+
+def test_derived_gates_are_memoized():
+    GATE_CACHE.clear()
+
+    gate = AdditionGate(5, 3, apply_QFT=False)
+    assert gate.get_inverse() is gate.get_inverse()
+    assert gate.get_controlled(2) is gate.get_controlled(2)
+    assert gate.get_controlled(2) is not gate.get_controlled(2, inverse=True)
+
+    # Variants are shared between instances with the same parameters
+    other_gate = AdditionGate(5, 3, apply_QFT=False)
+    assert other_gate.get_inverse() is gate.get_inverse()
+    assert other_gate.get_controlled(1) is gate.get_controlled(1)
+
+    lookup = LookupModularAdditionGate([0, 3, 10, 7], 11, 4)
+    assert (
+        LookupModularAdditionGate([0, 3, 10, 7], 11, 4).get_inverse()
+        is lookup.get_inverse()
+    )
+
+
+def test_native_gate_is_abstract():
+    class IncompleteGate(NativeGate):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteGate()
+
+
+@pytest.mark.parametrize("num_ctrl_qubits", [1, 2])
+def test_derived_gates(num_ctrl_qubits):
+    gate = BasisPermutationGate(np.array([3, 0, 1, 2]), 2)
+    native = Operator(gate.get_native())
+
+    npt.assert_allclose(
+        Operator(gate.get_inverse()).data, native.adjoint().data, atol=1e-10
+    )
+    npt.assert_allclose(
+        Operator(gate.get_controlled(num_ctrl_qubits)).data,
+        Operator(gate.get_native().control(num_ctrl_qubits)).data,
+        atol=1e-10,
+    )
+    npt.assert_allclose(
+        Operator(gate.get_controlled(num_ctrl_qubits, inverse=True)).data,
+        Operator(gate.get_native().inverse().control(num_ctrl_qubits)).data,
+        atol=1e-10,
+    )
@@ -0,0 +1,90 @@
+import pytest
+
+import pickle
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import qiskit as qk
+
+from qiskit.quantum_info import Operator
+
+from quantum.algorithms import Shor
+from quantum.gates import (
+    GATE_CACHE,
+    LazyGate,
+    AdditionGate,
+    AutoOracleGate,
+    BasisPermutationGate,
+    CModularInplaceMultiplicationGate,
+)
+
+
+@pytest.mark.parametrize(
+    "wrapper, num_qubits",
+    [
+        (AdditionGate(5, 3, apply_QFT=True, num_controls=2), 6),
+        (CModularInplaceMultiplicationGate(7, 15, 4), 11),
+        (BasisPermutationGate(lambda x: x ^ 1, 3, num_ancillas=1), 4),
+        (
+            AutoOracleGate(
+                lambda x: x, 2, 2, synthesis=AutoOracleGate.Synthesis.ReedMuller
+            ),
+            4,
+        ),
+    ],
+)
+def test_lazy_definition(wrapper, num_qubits):
+    GATE_CACHE.clear()
+    gate = wrapper.get_native()
+
+    assert isinstance(gate, LazyGate)
+    assert gate.wrapper is wrapper
+    assert gate.num_qubits == num_qubits
+    assert not gate.is_defined()
+
+    inverse = gate.inverse()
+    assert not gate.is_defined() and not inverse.is_defined()
+
+    assert gate.definition.num_qubits == num_qubits
+    assert gate.is_defined()
+
+
+def test_lazy_gate_pickle():
+    gate = CModularInplaceMultiplicationGate(2, 5, 3).get_native()
+    unpickled = pickle.loads(pickle.dumps(gate))
+
+    assert unpickled.name == gate.name
+    assert Operator(unpickled).equiv(Operator(gate))
+
+
+def test_lazy_definition_is_built_once():
+    builds = []
+
+    def build():
+        builds.append(None)
+        time.sleep(0.01)
+        qc = qk.QuantumCircuit(1)
+        qc.x(0)
+        return qc
+
+    gate = LazyGate("slow", 1, build)
+    with ThreadPoolExecutor(8) as executor:
+        definitions = list(executor.map(lambda _: gate.definition, range(8)))
+
+    assert len(builds) == 1
+    assert all(definition is definitions[0] for definition in definitions)
+
+
+def test_shor_circuit_is_lazy():
+    GATE_CACHE.clear()
+    N = 2**19 + 21
+    qc = Shor(N)._build_circuit(5)
+
+    gates = [
+        instruction.operation
+        for instruction in qc.data
+        if isinstance(instruction.operation, LazyGate)
+    ]
+    assert len(gates) > 0
+    assert not any(gate.is_defined() for gate in gates)
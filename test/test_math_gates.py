@@ -4,6 +4,9 @@ import qiskit as qk
 import qiskit_aer as qk_aer
 
 import numpy as np
+import numpy.testing as npt
+
+from qiskit.quantum_info import Operator
 
 from helper import test_matrix_using_basis, get_matrix_representation
 
@@ -12,6 +15,15 @@ from quantum.gates import (
     CCModularAdditionGate,
     CModularMultiplicationGate,
     CModularInplaceMultiplicationGate,
+    qft_gate,
+    default_approximation_degree,
+    approximation_report,
+    cancel_qft_pairs,
+    LazyGate,
+    LookupModularAdditionGate,
+    TableLookupGate,
+    WindowedModularMultiplicationGate,
+    append_qft,
 )
 from quantum.utils import get_bitmask, combine_basis_state, split_state
 
@@ -232,3 +244,224 @@ def test_modular_inplace_multiplication_gate(c, x, a, N, width):
         expected_result = (c, x, 0)
 
     assert result == expected_result, f"Result was {result}, expected {expected_result}"
+
+
+@pytest.mark.parametrize(
+    "a, width, apply_QFT, num_controls, inverse",
+    [
+        (3, 2, False, 1, False),
+        (3, 2, True, 2, True),
+        (5, 3, False, 2, False),
+        (5, 3, False, 2, True),
+        (6, 3, True, 1, True),
+    ],
+)
+def test_controlled_addition_gate(a, width, apply_QFT, num_controls, inverse):
+    gate = AdditionGate(
+        a, width, apply_QFT, num_controls=num_controls, inverse=inverse
+    ).get_native()
+
+    uncontrolled = AdditionGate(a, width, apply_QFT).get_native()
+    if inverse:
+        uncontrolled = uncontrolled.inverse()
+    expected = uncontrolled.control(num_controls)
+
+    npt.assert_allclose(
+        get_matrix_representation(gate),
+        get_matrix_representation(expected),
+        atol=1e-7,
+    )
+
+
+@pytest.mark.parametrize(
+    "num_qubits, expected",
+    [(1, 0), (4, 0), (8, 2), (16, 9), (64, 55)],
+)
+def test_default_approximation_degree(num_qubits, expected):
+    assert default_approximation_degree(num_qubits) == expected
+
+
+@pytest.mark.parametrize("num_qubits, approximation_degree", [(4, 1), (6, 3)])
+def test_approximate_qft(num_qubits, approximation_degree):
+    exact = qk.transpile(
+        qft_gate(num_qubits).definition, basis_gates=["cp", "h", "swap"]
+    )
+    approximate = qk.transpile(
+        qft_gate(num_qubits, approximation_degree).definition,
+        basis_gates=["cp", "h", "swap"],
+    )
+    assert approximate.count_ops()["cp"] < exact.count_ops()["cp"]
+
+    npt.assert_allclose(
+        get_matrix_representation(qft_gate(num_qubits, approximation_degree)),
+        get_matrix_representation(
+            qft_gate(num_qubits, approximation_degree, inverse=True).inverse()
+        ),
+        atol=1e-7,
+    )
+
+
+@pytest.mark.parametrize(
+    "a, b, width, approximation_degree", [(5, 9, 5, 1), (21, 17, 6, 2)]
+)
+def test_approximate_addition_gate(a, b, width, approximation_degree):
+    gate = AdditionGate(
+        a, width, apply_QFT=True, approximation_degree=approximation_degree
+    ).get_native()
+    probabilities = (
+        qk.quantum_info.Statevector.from_int(b, 2 ** (width + 1))
+        .evolve(gate)
+        .probabilities()
+    )
+    assert probabilities[a + b] > 0.8
+
+
+def test_approximation_report():
+    report = approximation_report(11, 53, 6, [0, 2, 4], num_samples=2, seed=0)
+
+    assert [row["approximation_degree"] for row in report] == [0, 2, 4]
+    assert report[0]["fidelity"] == pytest.approx(1)
+    sizes = [row["cx"] for row in report]
+    assert sizes == sorted(sizes, reverse=True) and sizes[0] > sizes[-1]
+
+
+@pytest.mark.parametrize("a_1, a_2, N, width", [(2, 3, 5, 3), (4, 2, 7, 3)])
+def test_cancel_qft_pairs(a_1, a_2, N, width):
+    gate_1 = CModularInplaceMultiplicationGate(a_1, N, width).get_native()
+    gate_2 = CModularInplaceMultiplicationGate(a_2, N, width).get_native()
+    qc = qk.QuantumCircuit(gate_1.num_qubits)
+    qc.append(gate_1, range(qc.num_qubits))
+    qc.append(gate_2, range(qc.num_qubits))
+
+    optimized, removed = cancel_qft_pairs(qc)
+
+    assert removed == {0: 1, 1: 1}
+    assert Operator(optimized).equiv(Operator(qc))
+
+
+@pytest.mark.parametrize(
+    "gate, inverse",
+    [
+        (AdditionGate(5, 3, apply_QFT=True), False),
+        (AdditionGate(3, 3, apply_QFT=False, num_controls=2), True),
+        (CCModularAdditionGate(3, 5, 3, apply_QFT=True), False),
+        (CCModularAdditionGate(4, 7, 3, apply_QFT=False, approximation_degree=1), True),
+        (CModularMultiplicationGate(2, 3, 2), False),
+        (CModularInplaceMultiplicationGate(2, 3, 2), True),
+        (TableLookupGate([0, 3, 1, 6, 7, 2, 5, 7], 3), True),
+        (LookupModularAdditionGate([0, 3, 1, 4], 5, 3), True),
+        (WindowedModularMultiplicationGate(2, 3, 2, 1), False),
+    ],
+)
+def test_emit_into(gate, inverse):
+    native = gate.get_inverse() if inverse else gate.get_native()
+    qc = qk.QuantumCircuit(native.num_qubits)
+    gate.emit_into(qc, qc.qubits, inverse=inverse)
+
+    assert all(
+        type(instruction.operation) not in (qk.circuit.Gate, LazyGate)
+        for instruction in qc.data
+    )
+    assert Operator(qc).equiv(Operator(native))
+
+
+@pytest.mark.parametrize("a, N, width", [(2, 5, 3), (4, 7, 3)])
+def test_parameterized_modular_inplace_multiplication_gate(a, N, width):
+    parameters = qk.circuit.ParameterVector("a", 2 * width)
+    gate = CModularInplaceMultiplicationGate(parameters, N, width)
+    values = CModularInplaceMultiplicationGate.parameter_values(a, N, width)
+
+    qc = qk.QuantumCircuit(2 * width + 3)
+    qc.append(gate.get_native(), qc.qubits)
+    bound = qc.assign_parameters(dict(zip(parameters, values)))
+
+    npt.assert_allclose(
+        get_matrix_representation(bound.to_gate()),
+        get_matrix_representation(
+            CModularInplaceMultiplicationGate(a, N, width).get_native()
+        ),
+        atol=1e-7,
+    )
+
+
+@pytest.mark.parametrize("a, N, width", [(2, 5, 3), (6, 7, 3)])
+def test_parameterized_cc_modular_addition_gate(a, N, width):
+    parameter = qk.circuit.Parameter("a")
+    gate = CCModularAdditionGate(N - parameter, N, width, apply_QFT=True)
+
+    qc = qk.QuantumCircuit(width + 4)
+    qc.append(gate.get_native(), qc.qubits)
+    bound = qc.assign_parameters({parameter: N - a})
+
+    npt.assert_allclose(
+        get_matrix_representation(bound.to_gate()),
+        get_matrix_representation(
+            CCModularAdditionGate(a, N, width, apply_QFT=True).get_native()
+        ),
+        atol=1e-7,
+    )
+
+
+def run_basis_state(qc: qk.QuantumCircuit, input: int) -> int:
+    """Runs ´qc´ on the basis state ´input´ and returns the measured basis state"""
+    prepared = qk.QuantumCircuit(qc.num_qubits)
+    for qubit in range(qc.num_qubits):
+        if input >> qubit & 1:
+            prepared.x(qubit)
+    prepared.compose(qc, inplace=True)
+    prepared.measure_all()
+
+    simulator = qk_aer.AerSimulator()
+    qct = qk.transpile(prepared, backend=simulator)
+    outcomes = simulator.run(qct, shots=1).result().get_counts().int_outcomes()
+    return next(iter(outcomes))
+
+
+@pytest.mark.parametrize(
+    "table, width",
+    [([0, 3, 10, 7], 4), ([2, 0, 1, 6, 5, 3, 4, 7], 3), ([5, 1, 7, 7, 0, 6, 2, 3], 3)],
+)
+def test_table_lookup_gate(table, width):
+    gate = TableLookupGate(table, width)
+    window = gate.window
+    qc = qk.QuantumCircuit(window + width + 1)
+    qc.append(gate.get_native(), qc.qubits)
+
+    for k in range(len(table)):
+        for y in [0, 2**width - 1]:
+            result = run_basis_state(qc, k | y << window)
+            assert result == k | (y ^ table[k]) << window
+
+
+@pytest.mark.parametrize(
+    "table, N, width", [([0, 3, 10, 7], 11, 4), ([2, 0, 1, 6, 5, 3, 4, 6], 7, 3)]
+)
+def test_lookup_modular_addition_gate(table, N, width):
+    gate = LookupModularAdditionGate(table, N, width)
+    window = gate.window
+    working = list(range(window, window + width + 1))
+    qc = qk.QuantumCircuit(window + 2 * width + 2)
+    append_qft(qc, working)
+    qc.append(gate.get_native(), qc.qubits)
+    append_qft(qc, working, inverse=True)
+
+    for k in range(len(table)):
+        for b in [0, 1, N - 1]:
+            result = run_basis_state(qc, k | b << window)
+            assert result == k | ((b + table[k]) % N) << window
+
+
+@pytest.mark.parametrize(
+    "a, N, width, window, multiplicand_window",
+    [(7, 15, 4, 2, 1), (2, 21, 5, 1, 2), (4, 7, 3, 3, 2)],
+)
+def test_windowed_modular_multiplication_gate(a, N, width, window, multiplicand_window):
+    gate = WindowedModularMultiplicationGate(a, N, width, window, multiplicand_window)
+    native = gate.get_native()
+    qc = qk.QuantumCircuit(native.num_qubits)
+    qc.append(native, qc.qubits)
+
+    for k in range(2**window):
+        for x in [1, 2, N - 1]:
+            result = run_basis_state(qc, k | x << window)
+            assert result == k | (pow(a, k, N) * x % N) << window
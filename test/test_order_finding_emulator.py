@@ -0,0 +1,65 @@
+import pytest
+import math
+
+from quantum.algorithms import Shor
+from quantum.simulators import OrderFindingEmulator
+from quantum.simulators.order_finding_emulator import multiplicative_order
+
+
+@pytest.mark.parametrize("a, N", [(7, 15), (2, 21), (3, 2**7), (5, 3**4 * 7**2)])
+def test_multiplicative_order(a, N):
+    r = 1
+    while pow(a, r, N) != 1:
+        r += 1
+
+    assert multiplicative_order(a, N) == r
+
+
+def test_emulator_exact_peaks():
+    # The order of 7 modulo 15 is 4, so every outcome is a multiple of 2^8 / 4
+    emulator = OrderFindingEmulator(shots=256, seed=0)
+
+    counts = emulator.sample(7, 15, 8)
+
+    assert set(counts) == {0, 64, 128, 192}
+    assert sum(counts.values()) == 256
+
+
+def test_emulator_distribution():
+    # With r = 6, every outcome is near a multiple of 2^10 / 6
+    emulator = OrderFindingEmulator(shots=1000, seed=1)
+
+    counts = emulator.sample(2, 21, 10)
+
+    near_peak = sum(
+        count
+        for outcome, count in counts.items()
+        if min(abs(outcome - s * 2**10 / 6) for s in range(7)) < 1
+    )
+    assert near_peak / 1000 > 0.7
+
+
+def test_emulator_seed():
+    assert OrderFindingEmulator(shots=64, seed=3).sample(
+        2, 10007 * 10009, 56
+    ) == OrderFindingEmulator(shots=64, seed=3).sample(2, 10007 * 10009, 56)
+
+
+@pytest.mark.parametrize(
+    "N, phase_estimation",
+    [
+        (1000003 * 1000033, Shor.PhaseEstimation.Semiclassical),
+        (1073741827 * 1073741831, Shor.PhaseEstimation.Static),
+    ],
+)
+def test_shor_with_emulator(N, phase_estimation):
+    emulator = OrderFindingEmulator(shots=4, seed=0)
+
+    result = Shor(N, phase_estimation=phase_estimation).run(emulator)
+    assert math.prod(result) == N
+    assert 1 < result[0] < N
+
+    result = Shor(N, phase_estimation=phase_estimation).run_batched(
+        emulator.run_circuits, batch_size=4
+    )
+    assert math.prod(result) == N
@@ -0,0 +1,72 @@
+import pytest
+
+from fractions import Fraction
+
+from quantum.algorithms import AlgorithmException, OrderPostprocessing
+from quantum.algorithms.order_postprocessing import convergents
+
+
+def order(a, N):
+    r, x = 1, a % N
+    while x != 1:
+        x = x * a % N
+        r += 1
+    return r
+
+
+@pytest.mark.parametrize(
+    "numerator, L", [(0, 8), (64, 8), (171, 8), (12345, 20), (3**120, 200)]
+)
+def test_convergents(numerator, L):
+    result = list(convergents(numerator, 2**L, 2**L))
+
+    assert result[-1] == Fraction(numerator, 2**L)
+    for convergent in result:
+        assert abs(Fraction(numerator, 2**L) - convergent) < Fraction(
+            1, convergent.denominator**2
+        )
+    for previous, convergent in zip(result, result[1:]):
+        assert convergent.denominator >= previous.denominator
+
+
+@pytest.mark.parametrize(
+    "a, N, outcomes",
+    [
+        (7, 15, {64: 1}),
+        (7, 15, {128: 1, 64: 1}),
+        (2, 21, {round(5 * 2**10 / 6): 3, 0: 5}),
+        # k = 2 and k = 3 share factors with r = 6, only their lcm is the order
+        (2, 21, {round(2 * 2**10 / 6): 1, round(3 * 2**10 / 6): 1}),
+    ],
+)
+def test_find_order(a, N, outcomes):
+    L = 2 * (N - 1).bit_length()
+    postprocessing = OrderPostprocessing(N, L)
+
+    assert postprocessing.find_order(a, outcomes) == order(a, N)
+
+
+def test_find_order_large():
+    N, a = 1009 * 1013, 5
+    L = 2 * (N - 1).bit_length()
+    r = order(a, N)
+    outcomes = {round(k * 2**L / r): 1 for k in [6, 35]}
+
+    postprocessing = OrderPostprocessing(N, L)
+
+    assert postprocessing.find_order(a, outcomes) == r
+    assert postprocessing.factors(a, outcomes) in [(1009, 1013), (1013, 1009)]
+
+
+def test_ranked_candidates():
+    postprocessing = OrderPostprocessing(15, 8, max_multiple=1, num_lcm_candidates=0)
+
+    candidates = postprocessing.ranked_candidates({64: 1, 192: 5, 128: 2})
+
+    assert candidates == [(4, 6), (2, 2)]
+
+
+@pytest.mark.parametrize("a, outcomes", [(7, {0: 4}), (14, {128: 1})])
+def test_factors_failure(a, outcomes):
+    with pytest.raises(AlgorithmException):
+        OrderPostprocessing(15, 8).factors(a, outcomes)
@@ -0,0 +1,72 @@
+import pytest
+import math
+
+from quantum.algorithms import Prescreening
+from quantum.algorithms.prescreening import (
+    integer_root,
+    is_probable_prime,
+    prime_factorization,
+    primes_below,
+)
+
+
+@pytest.mark.parametrize(
+    "N, expected",
+    [
+        (15, (3, 5)),
+        (4, (2, 2)),
+        (997 * 1009, (997, 1009)),
+        (1009**3, (1009, 1009**2)),
+        (1000003 * 1000033, None),
+        ((2**127 - 1) * (2**89 - 1), None),
+    ],
+)
+def test_factorize(N, expected):
+    assert Prescreening().factorize(N) == expected
+
+
+@pytest.mark.parametrize("N", [2, 13, 1009, 2**89 - 1, 2**127 - 1])
+def test_factorize_prime(N):
+    with pytest.raises(ValueError):
+        Prescreening().factorize(N)
+
+
+def test_stages():
+    prescreening = Prescreening(stages=[Prescreening.Stage.Primality])
+    assert prescreening.factorize(15) is None
+    assert prescreening.hits[Prescreening.Stage.TrialDivision] == 0
+    assert prescreening.timings[Prescreening.Stage.Primality] > 0
+
+    with pytest.raises(ValueError):
+        prescreening.factorize(1009)
+    assert prescreening.hits[Prescreening.Stage.Primality] == 1
+
+
+@pytest.mark.parametrize("n", [0, 1, 26, 27, 28, 10**6, 3**301, 3**301 - 1])
+@pytest.mark.parametrize("k", [2, 3, 7])
+def test_integer_root(n, k):
+    root = integer_root(n, k)
+    assert root**k <= n < (root + 1) ** k
+
+
+@pytest.mark.parametrize(
+    "n, expected",
+    [(1, False), (2, True), (561, False), (2**61 - 1, True), (2**67 - 1, False)],
+)
+def test_is_probable_prime(n, expected):
+    assert is_probable_prime(n) == expected
+
+
+@pytest.mark.parametrize("bound", [2, 30, 1000])
+def test_primes_below(bound):
+    assert primes_below(bound) == [p for p in range(bound) if is_probable_prime(p)]
+
+
+@pytest.mark.parametrize(
+    "n", [2, 97, 2**10, 3**4 * 7**2, 1000003 * 1000033, (2**31 - 1) ** 2 * 3]
+)
+def test_prime_factorization(n):
+    factors = prime_factorization(n)
+
+    assert math.prod(p**k for p, k in factors.items()) == n
+    assert all(is_probable_prime(p) for p in factors)
@@ -0,0 +1,122 @@
+import pytest
+
+import qiskit as qk
+
+from quantum.algorithms import Shor
+from quantum.gates import (
+    AdditionGate,
+    CCModularAdditionGate,
+    CModularMultiplicationGate,
+    CModularInplaceMultiplicationGate,
+    LookupModularAdditionGate,
+    TableLookupGate,
+    WindowedModularMultiplicationGate,
+)
+from quantum.resources import ResourceEstimate
+
+BASIS_GATES = [
+    "h",
+    "x",
+    "p",
+    "cp",
+    "mcphase",
+    "cx",
+    "ccx",
+    "mcx",
+    "swap",
+    "cswap",
+    "rz",
+]
+
+
+def decompose(gate: qk.circuit.Gate) -> qk.QuantumCircuit:
+    """Decomposes ´gate´ into the gate types counted by the estimates"""
+    qc = qk.QuantumCircuit(gate.num_qubits)
+    qc.append(gate, range(gate.num_qubits))
+    while names := {i.operation.name for i in qc.data} - set(BASIS_GATES):
+        qc = qc.decompose(gates_to_decompose=list(names))
+    return qc
+
+
+@pytest.mark.parametrize(
+    "gate, exact",
+    [
+        # With all bits set, every target qubit of the adders receives a phase
+        (AdditionGate(15, 4, apply_QFT=True, num_controls=2), True),
+        (AdditionGate(7, 3, apply_QFT=False, num_controls=3), True),
+        (AdditionGate(5, 4, apply_QFT=True, approximation_degree=2), False),
+        (CCModularAdditionGate(7, 7, 3, apply_QFT=True), True),
+        (CCModularAdditionGate(3, 11, 4, apply_QFT=False), False),
+        (CModularMultiplicationGate(7, 15, 4, approximation_degree=1), False),
+        (CModularInplaceMultiplicationGate(7, 15, 4), False),
+        # Every monomial appears in the expansion of every output bit
+        (TableLookupGate([7, 0, 0, 0, 0, 0, 0, 0], 3), True),
+        (LookupModularAdditionGate([0, 3, 5, 1], 7, 3), False),
+        (WindowedModularMultiplicationGate(2, 7, 3, 2), False),
+    ],
+)
+def test_resource_estimate(gate, exact):
+    estimate = gate.resource_estimate()
+    native = gate.get_native()
+
+    assert estimate.num_qubits == native.num_qubits
+    assert estimate.depth >= decompose(native).depth()
+
+    qc = qk.QuantumCircuit(native.num_qubits)
+    qc.append(native, range(native.num_qubits))
+    qct = qk.transpile(qc, basis_gates=["u", "cx"], optimization_level=0)
+    cx_count = qct.count_ops().get("cx", 0)
+    if exact:
+        assert estimate.cx_count() == cx_count
+    else:
+        assert estimate.cx_count() >= cx_count
+
+
+def test_resource_estimate_arithmetic():
+    estimate = ResourceEstimate(2, {"cp": 1, "h": 2}, depth=2)
+
+    assert (estimate * 3).gate_counts == {"cp": 3, "h": 6}
+    assert (estimate + ResourceEstimate(3, {"cswap": 1}, depth=1)).depth == 3
+    assert (estimate * 2 - estimate).gate_counts == {"cp": 1, "h": 2}
+    assert ResourceEstimate(4, {"ccp": 1, "cccp": 1}).cx_count() == 6 + 20
+
+
+def test_shor_resource_estimate():
+    algorithm = Shor(15)
+    estimate = algorithm.resource_estimate()
+    qc = algorithm._build_circuit(7)
+
+    assert estimate.num_qubits == qc.num_qubits
+
+    # A 2048-bit modulus is estimated without building any gates
+    estimate = Shor(2**2047 + 1).resource_estimate()
+    assert estimate.num_qubits == 2 * 2048 + 3
+    assert estimate.gate_counts["measure"] == 2 * 2048
+
+
+@pytest.mark.parametrize(
+    "correction, correction_threshold, rz",
+    [
+        (Shor.Correction.Chain, 0.0, 8 * 7 // 2),
+        (Shor.Correction.Chain, 0.2, 0 + 1 + 2 + 3 * 5),
+        # One rotation per switch case, with 2^3 - 1 cases once the window is full
+        (Shor.Correction.Lookup, 0.2, 0 + 1 + 3 + 7 * 5),
+    ],
+)
+def test_shor_correction_resource_estimate(correction, correction_threshold, rz):
+    algorithm = Shor(
+        15, correction=correction, correction_threshold=correction_threshold
+    )
+
+    assert algorithm.resource_estimate().gate_counts["rz"] == rz
+
+
+@pytest.mark.parametrize("window_size", [1, 2, 3])
+def test_shor_windowed_resource_estimate(window_size):
+    algorithm = Shor(
+        15, phase_estimation=Shor.PhaseEstimation.Static, window_size=window_size
+    )
+    estimate = algorithm.resource_estimate()
+
+    assert estimate.num_qubits == algorithm._build_circuit(7).num_qubits
+    assert estimate.gate_counts["swap" if window_size > 1 else "cswap"] > 0
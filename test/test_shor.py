@@ -1,14 +1,26 @@
 import pytest
 import math
+import multiprocessing
+import pickle
+import threading
+import time
+
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 
 from qiskit import transpile
 from qiskit_aer import AerSimulator
 
-from quantum.algorithms import Shor
+from quantum.algorithms import Shor, Prescreening
+from quantum.simulators import OrderFindingEmulator
 
 NUM_SHOTS = 1
 
 
+def quantum_only():
+    """Disables the classical prescreening, so that N reaches the circuit"""
+    return Prescreening(stages=[])
+
+
 @pytest.mark.parametrize("N", [15, 12])
 def test_deutschjozsa(N):
     def simulate_qc(qc):
@@ -21,9 +33,365 @@ def test_deutschjozsa(N):
             .int_outcomes()
         )
 
-    algorithm = Shor(N)
+    algorithm = Shor(N, prescreening=quantum_only())
     result = algorithm.run(simulate_qc)
 
     assert math.prod(result) == N
     for factor in result:
         assert 1 < factor < N
+
+
+def test_shor_cancel_qfts():
+    def simulate_qc(qc):
+        simulator = AerSimulator()
+        qct = transpile(qc, backend=simulator)
+        return (
+            simulator.run(qct, shots=NUM_SHOTS, memory=False)
+            .result()
+            .get_counts()
+            .int_outcomes()
+        )
+
+    algorithm = Shor(15, cancel_qfts=True, prescreening=quantum_only())
+    result = algorithm.run(simulate_qc)
+
+    assert math.prod(result) == 15
+    assert algorithm.removed_qfts is not None
+
+
+def test_shor_removed_qfts_per_multiplication():
+    # The schedule of 2 mod 21 repeats the factors 4 and 16, which must still be
+    # counted separately
+    algorithm = Shor(21, cancel_qfts=True, prescreening=quantum_only())
+    algorithm._build_circuit(2)
+
+    counts = [algorithm.removed_qfts[index] for index in sorted(algorithm.removed_qfts)]
+    assert counts == [1] + [2] * 8 + [1]
+
+
+def test_shor_measures_multiples_of_order():
+    simulator = AerSimulator()
+    algorithm = Shor(21, prescreening=quantum_only())
+
+    qc = algorithm._build_circuit(2)
+    counts = (
+        simulator.run(transpile(qc, backend=simulator), shots=16, seed_simulator=0)
+        .result()
+        .get_counts()
+        .int_outcomes()
+    )
+
+    # The order of 2 is 6, so the outcomes lie close to multiples of 2^10 / 6
+    near = sum(
+        count
+        for outcome, count in counts.items()
+        if min(abs(outcome * 6 - j * 2**10) for j in range(7)) <= 6
+    )
+    assert near >= 12
+
+
+def test_shor_parameterized():
+    simulator = AerSimulator()
+    transpiled = []
+
+    def transpile_qc(qc):
+        transpiled.append(qc)
+        return transpile(qc, backend=simulator)
+
+    def simulate_qc(qct):
+        return (
+            simulator.run(qct, shots=NUM_SHOTS, memory=False)
+            .result()
+            .get_counts()
+            .int_outcomes()
+        )
+
+    algorithm = Shor(
+        15,
+        parameterized=True,
+        transpile=transpile_qc,
+        prescreening=quantum_only(),
+    )
+    circuits = [algorithm._build_circuit(a) for a in [2, 7, 11]]
+    assert len(transpiled) == 1
+    assert all(len(qc.parameters) == 0 for qc in circuits)
+
+    result = algorithm.run(simulate_qc)
+    assert math.prod(result) == 15
+    assert len(transpiled) == 1
+
+
+@pytest.mark.parametrize("batch_size", [1, 4])
+def test_shor_batched(batch_size):
+    simulator = AerSimulator()
+    batches = []
+
+    def simulate_qcs(qcs):
+        batches.append(len(qcs))
+        qcts = transpile(qcs, backend=simulator)
+        result = simulator.run(qcts, shots=16, memory=False).result()
+        for i in range(len(qcts)):
+            yield result.get_counts(i).int_outcomes()
+
+    algorithm = Shor(15, prescreening=quantum_only())
+    result = algorithm.run_batched(simulate_qcs, batch_size=batch_size)
+
+    assert math.prod(result) == 15
+    assert all(size <= batch_size for size in batches)
+
+
+def test_shor_bases_are_not_repeated():
+    algorithm = Shor(15, prescreening=quantum_only())
+    bases = algorithm._draw_bases(5) + algorithm._draw_bases(20)
+
+    assert sorted(bases) == list(range(3, 15))
+    assert algorithm._draw_bases(1) == []
+
+
+def test_shor_concurrent():
+    simulator = AerSimulator()
+
+    def simulate_qc(qc):
+        qct = transpile(qc, backend=simulator)
+        return (
+            simulator.run(qct, shots=16, memory=False)
+            .result()
+            .get_counts()
+            .int_outcomes()
+        )
+
+    algorithm = Shor(15, prescreening=quantum_only())
+    result = algorithm.run_concurrent(simulate_qc, max_workers=3)
+
+    assert math.prod(result) == 15
+
+
+def emulate_slowly(qc):
+    """Emulates the circuit for the base 7 at once and for the other bases only
+    after a long time"""
+    if qc.metadata["a"] != 7:
+        time.sleep(60)
+    return OrderFindingEmulator(shots=64, seed=0)(qc)
+
+
+def only_bases(algorithm, bases):
+    algorithm._tried_bases = set(range(3, algorithm.N)) - set(bases)
+
+
+def test_shor_concurrent_stops_attempts():
+    lock = threading.Lock()
+    running = []
+
+    def run_circuit(qc):
+        with lock:
+            running.append(qc.metadata["a"])
+        try:
+            if qc.metadata["a"] != 7:
+                time.sleep(0.5)
+            return OrderFindingEmulator(shots=64, seed=0)(qc)
+        finally:
+            with lock:
+                running.remove(qc.metadata["a"])
+
+    algorithm = Shor(15, prescreening=quantum_only())
+    only_bases(algorithm, [4, 7, 8, 11])
+    num_threads = threading.active_count()
+    result = algorithm.run_concurrent(run_circuit, max_workers=4)
+
+    assert math.prod(result) == 15
+    assert running == []
+    assert threading.active_count() == num_threads
+
+
+def test_shor_concurrent_terminates_processes():
+    algorithm = Shor(15, prescreening=quantum_only())
+    only_bases(algorithm, [4, 7, 8, 11])
+
+    start = time.perf_counter()
+    result = algorithm.run_concurrent(emulate_slowly, max_workers=4, processes=True)
+
+    assert math.prod(result) == 15
+    assert time.perf_counter() - start < 30
+    assert multiprocessing.active_children() == []
+
+
+def test_shor_cancelled_attempt():
+    def run_circuit(qc):
+        raise AssertionError("A cancelled attempt must not run its circuit")
+
+    cancelled = threading.Event()
+    cancelled.set()
+    with pytest.raises(CancelledError):
+        Shor(15, prescreening=quantum_only())._run_single_pass(
+            7, run_circuit, cancelled
+        )
+
+
+def test_shor_concurrent_template():
+    transpiled = []
+
+    def transpile_qc(qc):
+        transpiled.append(qc)
+        return qc
+
+    algorithm = Shor(
+        15, parameterized=True, transpile=transpile_qc, prescreening=quantum_only()
+    )
+    with ThreadPoolExecutor(4) as executor:
+        circuits = list(executor.map(algorithm._build_circuit, [2, 7, 8, 11]))
+
+    assert len(transpiled) == 1
+    assert all(len(qc.parameters) == 0 for qc in circuits)
+
+    unpickled = pickle.loads(pickle.dumps(Shor(15, prescreening=quantum_only())))
+    assert unpickled._build_circuit(7).num_qubits == 11
+
+
+@pytest.mark.parametrize(
+    "N, stage",
+    [
+        (21, Prescreening.Stage.TrialDivision),
+        (1009**2, Prescreening.Stage.PerfectPower),
+    ],
+)
+def test_shor_prescreening(N, stage):
+    prescreening = Prescreening()
+
+    result = Shor(N, prescreening=prescreening).run(None)
+
+    assert math.prod(result) == N
+    assert prescreening.hits[stage] == 1
+
+
+def test_shor_even_N():
+    N = 2 * (2**61 - 1)
+
+    assert Shor(N).run(None) == (2, 2**61 - 1)
+
+
+def test_shor_lucky_gcd():
+    prescreening = Prescreening(stages=[Prescreening.Stage.LuckyGcd])
+    algorithm = Shor(1009 * 1013, prescreening=prescreening)
+
+    assert algorithm._run_single_pass(3 * 1013, None) == (1013, 1009)
+    assert prescreening.hits[Prescreening.Stage.LuckyGcd] == 1
+
+
+@pytest.mark.parametrize(
+    "a, N", [(7, 15), (4, 15), (2**40 + 3, (2**61 - 1) * (2**31 - 1))]
+)
+def test_shor_exponent_schedule(a, N):
+    algorithm = Shor(N)
+    L = 2 * (N - 1).bit_length()
+
+    factors, skipped = algorithm.exponent_schedule(a)
+
+    assert factors == [pow(a, 2 ** (L - 1 - bit), N) for bit in range(L)]
+    assert skipped == [bit for bit in range(L) if factors[bit] == 1]
+
+
+@pytest.mark.parametrize(
+    "correction, correction_threshold",
+    [
+        (Shor.Correction.Chain, 0.0),
+        (Shor.Correction.Chain, 0.2),
+        (Shor.Correction.Lookup, 0.0),
+        (Shor.Correction.Lookup, 0.2),
+    ],
+)
+def test_shor_correction(correction, correction_threshold):
+    simulator = AerSimulator()
+    algorithm = Shor(
+        15,
+        correction=correction,
+        correction_threshold=correction_threshold,
+        prescreening=quantum_only(),
+    )
+
+    qc = algorithm._build_circuit(7)
+    counts = (
+        simulator.run(transpile(qc, backend=simulator), shots=64, seed_simulator=0)
+        .result()
+        .get_counts()
+        .int_outcomes()
+    )
+
+    # The order of 7 is 4, so only multiples of 2^8 / 4 can be measured
+    assert {outcome % 2**8 for outcome in counts} <= {0, 64, 128, 192}
+    assert math.prod(algorithm._evaluate_counts(7, counts)) == 15
+
+
+def test_shor_lookup_window_is_capped():
+    with pytest.raises(ValueError):
+        Shor(21, correction=Shor.Correction.Lookup)
+
+    algorithm = Shor(253, correction=Shor.Correction.Lookup, correction_threshold=0.01)
+    assert algorithm._correction_window() == Shor.MAX_LOOKUP_WINDOW
+
+
+@pytest.mark.parametrize("num_counting_qubits", [None, 6])
+def test_shor_static(num_counting_qubits):
+    simulator = AerSimulator()
+    algorithm = Shor(
+        15,
+        phase_estimation=Shor.PhaseEstimation.Static,
+        num_counting_qubits=num_counting_qubits,
+        prescreening=quantum_only(),
+    )
+    L = num_counting_qubits or 8
+
+    qc = algorithm._build_circuit(7)
+    ops = qc.count_ops()
+    counts = (
+        simulator.run(transpile(qc, backend=simulator), shots=64, seed_simulator=0)
+        .result()
+        .get_counts()
+        .int_outcomes()
+    )
+
+    assert "reset" not in ops and "if_else" not in ops
+    assert ops["measure"] == L
+    assert qc.num_qubits == algorithm.resource_estimate().num_qubits
+    assert set(counts) <= {0, 2**L // 4, 2**L // 2, 3 * 2**L // 4}
+    assert math.prod(algorithm._evaluate_counts(7, counts)) == 15
+
+
+@pytest.mark.parametrize("window_size", [2, 3])
+def test_shor_windowed(window_size):
+    simulator = AerSimulator()
+    algorithm = Shor(
+        15,
+        phase_estimation=Shor.PhaseEstimation.Static,
+        window_size=window_size,
+        prescreening=quantum_only(),
+    )
+
+    qc = algorithm._build_circuit(7)
+    counts = (
+        simulator.run(transpile(qc, backend=simulator), shots=64, seed_simulator=0)
+        .result()
+        .get_counts()
+        .int_outcomes()
+    )
+
+    assert set(counts) <= {0, 64, 128, 192}
+    assert math.prod(algorithm._evaluate_counts(7, counts)) == 15
+
+
+@pytest.mark.parametrize("N, a", [(15, 7), (21, 2)])
+def test_shor_windowed_is_smaller(N, a):
+    def transpiled(window_size):
+        algorithm = Shor(
+            N, phase_estimation=Shor.PhaseEstimation.Static, window_size=window_size
+        )
+        return transpile(algorithm._build_circuit(a), basis_gates=["cx", "u"])
+
+    plain, windowed = transpiled(1), transpiled(2)
+
+    assert windowed.depth() < plain.depth()
+    assert windowed.count_ops()["cx"] < plain.count_ops()["cx"]
+
+
+def test_shor_windowed_requires_static():
+    with pytest.raises(ValueError):
+        Shor(15, window_size=2)
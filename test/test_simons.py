@@ -97,3 +97,27 @@ def test_simons(f, n, m, expected_result):
     result = algorithm.run(simulate_qc)
 
     assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    "f, n, m, num_ancillas, dirty_ancillas, expected_result",
+    [
+        (lambda x: x, 2, 2, 1, False, 0),
+        (lambda x: x, 2, 2, 1, True, 0),
+    ],
+)
+def test_simons_with_ancillas(f, n, m, num_ancillas, dirty_ancillas, expected_result):
+    def simulate_qc(qc):
+        simulator = AerSimulator()
+        qct = transpile(qc, backend=simulator)
+        return simulator.run(qct, shots=n + 10, memory=False).result().get_counts()
+
+    oracle = AutoOracleGate(
+        f, n, m, num_ancillas=num_ancillas, dirty_ancillas=dirty_ancillas
+    )
+    native_gate = oracle.get_native()
+    algorithm = Simons(native_gate, n, m)
+
+    result = algorithm.run(simulate_qc)
+
+    assert result == expected_result